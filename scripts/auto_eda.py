@@ -10,36 +10,122 @@ Auto EDA v2:
 """
 
 from __future__ import annotations
+import copy
+import itertools
 import os
+import re
 import math
 import json
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
+from matplotlib.figure import Figure
+from concurrent.futures import ProcessPoolExecutor
 
 import sys as _sys
 _sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from load_data import load_data
+from load_data import (load_data, iter_chunks, detect_encoding, csv_row_boundary, iter_csv_range,
+                       detect_salary_columns, iter_salary_parsed, is_dataset, resolve_sheet,
+                       split_ext, CSV_ENGINES)
 from find_chinese_font import find_chinese_font
+from sketches import approx_nunique
+from stream_profile import StreamProfile
+from profile_stats import (ProfileStats, QUANTILE_METHODS, column_quartiles, iqr_summary,
+                           topk_counts, trend_points)
+from profile_cache import cache_key, load_cached, store
+from incremental import load_state, save_state
+from duckdb_profile import duckdb_stats
+from pixel_agg import line_pixels
+from output_profiles import FORMATS, PROFILES, OutputProfile, get_profile
+
+# Where run() computes statistics: pandas in memory, or DuckDB out of core
+BACKENDS = ("pandas", "duckdb")
 
 
 def _ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
 
 
-def infer_column_roles(df: pd.DataFrame):
-    """Infer column roles: numeric, categorical, datetime, id-like."""
+# Cheap pre-check for date-like strings: digit-separator-digit, yyyymmdd, a
+# bare year or an English month name. Long free text (job descriptions etc.)
+# is never a date.
+_DATE_HINT = re.compile(
+    r"\d{1,4}\s*[-/.年月:]\s*\d{1,2}|\d{8}|^\s*\d{4}\s*$"
+    r"|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec",
+    re.IGNORECASE,
+)
+_DATE_MAX_LEN = 40
+_DISTINCT_K = 4096
+
+
+def _sample_positions(n, size, strata=10, seed=0):
+    """Row positions of a stratified sample: ``size`` rows spread over ``strata`` blocks."""
+    per = max(1, size // strata)
+    edges = np.linspace(0, n, strata + 1)
+    rng = np.random.default_rng(seed)
+    lo, width = edges[:-1, None], np.diff(edges)[:, None]
+    pos = (lo + rng.random((strata, per)) * width).astype(np.int64).ravel()
+    return np.unique(np.clip(pos, 0, n - 1))
+
+
+def _is_text(s):
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _is_text(s.cat.categories)
+    return pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s)
+
+
+def _datetime_rate(s, floor=0.0):
+    """``(rate, parsed)``: share of ``s`` (nulls included) parseable as datetime.
+
+    Values failing the regex/length pre-check are counted as non-dates without
+    being parsed; if that upper bound is already below ``floor`` nothing is
+    parsed at all, the bound is returned and ``parsed`` is None. Otherwise
+    ``parsed`` holds the parsed values of the rows that passed the pre-check.
+    """
+    n = len(s)
+    text = s.dropna().astype(str)
+    hint = text[text.str.len().le(_DATE_MAX_LEN) & text.str.contains(_DATE_HINT)]
+    if n == 0 or len(hint) / n < floor:
+        return len(hint) / max(1, n), None
+    parsed = pd.to_datetime(hint, errors="coerce", format="mixed")
+    return parsed.notna().sum() / n, parsed
+
+
+def infer_column_roles(df: pd.DataFrame, sample_size=10_000, datetime_threshold=0.7,
+                       borderline=0.1, id_ratio=0.9, parsed=None):
+    """Infer column roles: numeric, categorical, datetime, id-like.
+
+    Decisions are made on a stratified sample of ``sample_size`` rows. Columns
+    whose sampled datetime parse rate lands within ``borderline`` of
+    ``datetime_threshold`` are confirmed on the full column. The id-like
+    unique ratio uses an approximate distinct count on large frames.
+
+    If ``parsed`` is a dict, text datetime columns that were parsed in full
+    (small frames, borderline columns) are stored in it as datetime Series,
+    for ``ProfileStats.from_frame(parsed_dates=...)`` to reuse.
+    """
     roles = {"numeric": [], "categorical": [], "datetime": [], "id_like": []}
+    n = len(df)
+    pos = _sample_positions(n, sample_size) if n > sample_size else None
 
     for col in df.columns:
         s = df[col]
 
-        # Try datetime
-        if s.dtype == "object":
-            parsed = pd.to_datetime(s, errors="coerce", format="mixed")
-            # treat as datetime if enough parse success
-            if parsed.notna().mean() >= 0.7:
+        # Try datetime (already parsed, e.g. by Parquet or the pyarrow CSV engine)
+        if pd.api.types.is_datetime64_any_dtype(s):
+            roles["datetime"].append(col)
+            continue
+        if _is_text(s):
+            sample = s if pos is None else s.iloc[pos]
+            rate, dates = _datetime_rate(sample, floor=datetime_threshold - borderline)
+            full = pos is None
+            if not full and abs(rate - datetime_threshold) < borderline:
+                rate, dates = _datetime_rate(s, floor=datetime_threshold)
+                full = True
+            if rate >= datetime_threshold:
                 roles["datetime"].append(col)
+                if parsed is not None and full and s.index.is_unique:
+                    parsed[col] = dates.reindex(s.index)
                 continue
 
         # Numeric
@@ -48,10 +134,20 @@ def infer_column_roles(df: pd.DataFrame):
             continue
 
         # Categorical vs id-like
-        nunique = s.nunique(dropna=True)
-        n = len(s)
+        if n == 0:
+            roles["categorical"].append(col)
+            continue
+        # Categoricals count distinct on their codes; text columns (object or
+        # pandas' str dtype) are sketched on large frames
+        if pos is None or isinstance(s.dtype, pd.CategoricalDtype) or not _is_text(s):
+            ratio = s.nunique(dropna=True) / n
+        else:
+            ratio = approx_nunique(s, k=_DISTINCT_K) / n
+            # KMV error is ~1/sqrt(k); confirm exactly when too close to call
+            if abs(ratio - id_ratio) < 3 * ratio / math.sqrt(_DISTINCT_K):
+                ratio = s.nunique(dropna=True) / n
         # Heuristic: id-like if unique ratio high
-        if n > 0 and (nunique / n) > 0.9:
+        if ratio > id_ratio:
             roles["id_like"].append(col)
         else:
             roles["categorical"].append(col)
@@ -62,64 +158,142 @@ def infer_column_roles(df: pd.DataFrame):
 def _set_chinese_font():
     chinese_font = find_chinese_font()
     if chinese_font:
-        plt.rcParams["axes.unicode_minus"] = False
+        matplotlib.rcParams["axes.unicode_minus"] = False
     return chinese_font
 
 
-def save_hist(df, col, outpath, font=None):
-    plt.close("all")
-    fig, ax = plt.subplots(figsize=(10, 6))
-    s = df[col].dropna()
-    ax.hist(s, bins=30)
-    ax.set_title(f"分布直方图: {col}" if font else f"Histogram: {col}",
-                 fontproperties=font)
-    ax.set_xlabel(col, fontproperties=font)
-    ax.set_ylabel("Count", fontproperties=font)
-    if font:
-        for label in ax.get_xticklabels() + ax.get_yticklabels():
-            label.set_fontproperties(font)
-    fig.tight_layout()
-    fig.savefig(outpath, dpi=300, bbox_inches="tight")
+class _ChartTemplate:
+    """A figure built once per chart kind and shape, reused for every chart of it.
 
+    Building the Figure, axes, fonts and spines dominates the cost of a small
+    chart; a template keeps them and each chart only swaps the data artists
+    in ``artists`` before ``save``.
+    """
 
-def save_bar_topk(df, col, outpath, k=20, font=None):
-    plt.close("all")
-    vc = df[col].astype(str).value_counts(dropna=True).head(k)
-    # Truncate long labels to 15 chars
-    labels = [s if len(s) <= 15 else s[:14] + "…" for s in vc.index]
+    def __init__(self, figsize, font=None):
+        self.fig = Figure(figsize=figsize)
+        self.ax = self.fig.subplots()
+        self.font = font
+        self.artists = None
+        p = self.fig.subplotpars
+        self._margins = dict(left=p.left, right=p.right, bottom=p.bottom, top=p.top)
+
+    def save(self, outpath, profile=None):
+        profile = get_profile(profile)
+        ax = self.ax
+        ax.relim()
+        ax.autoscale_view()
+        if self.font:
+            for label in ax.get_xticklabels() + ax.get_yticklabels():
+                label.set_fontproperties(self.font)
+        # Lay out from the default margins every time, so a chart's geometry
+        # depends only on its own labels, not on which chart used the
+        # template before (and so not on --jobs)
+        self.fig.subplots_adjust(**self._margins)
+        self.fig.tight_layout()
+        profile.save(self.fig, outpath)
+
+
+# Per-process template cache, keyed by (chart kind, shape, font)
+_TEMPLATES = {}
+
+
+def _template(key, build):
+    if key not in _TEMPLATES:
+        _TEMPLATES[key] = build()
+    return _TEMPLATES[key]
+
+
+def _hist_template(bins, font=None):
+    t = _ChartTemplate((10, 6), font)
+    t.artists = t.ax.bar(np.arange(bins), np.zeros(bins), width=1.0, align="edge")
+    t.ax.set_ylabel("Count", fontproperties=font)
+    return t
+
+
+def _plot_hist(counts, edges, col, outpath, font=None, profile=None):
+    t = _template(("hist", len(counts), font), lambda: _hist_template(len(counts), font))
+    for rect, left, width, height in zip(t.artists, edges[:-1], np.diff(edges), counts):
+        rect.set_x(left)
+        rect.set_width(width)
+        rect.set_height(height)
+    t.ax.set_title(f"分布直方图: {col}" if font else f"Histogram: {col}",
+                   fontproperties=font)
+    t.ax.set_xlabel(col, fontproperties=font)
+    t.save(outpath, profile)
+
+
+def _hist_data(df, col, bins=30):
+    return np.histogram(df[col].dropna(), bins=bins)
+
+
+def save_hist(df, col, outpath, font=None, profile=None):
+    counts, edges = _hist_data(df, col)
+    _plot_hist(counts, edges, col, outpath, font=font, profile=profile)
+
+
+def _bar_template(n, font=None):
     # Use horizontal bar chart for readability
-    height = max(6, len(vc) * 0.4)
-    fig, ax = plt.subplots(figsize=(10, height))
-    y_pos = range(len(vc))
-    ax.barh(y_pos, vc.values, color="#4C72B0", edgecolor="white", linewidth=0.8)
+    t = _ChartTemplate((10, max(6, n * 0.4)), font)
+    ax = t.ax
+    y_pos = range(n)
+    bars = ax.barh(y_pos, np.zeros(n), color="#4C72B0", edgecolor="white", linewidth=0.8)
+    # Count labels on bars
+    texts = [ax.text(0, i, "", va="center", fontsize=9, fontproperties=font) for i in y_pos]
     ax.set_yticks(y_pos)
-    ax.set_yticklabels(labels)
     ax.invert_yaxis()  # highest count on top
-    ax.set_title(f"Top {k} 类别频数: {col}" if font else f"Top {k} categories: {col}",
-                 fontproperties=font)
-    ax.set_xlabel("Count", fontproperties=font)
-    ax.set_ylabel(col, fontproperties=font)
-    # Add count labels on bars
-    for i, v in enumerate(vc.values):
-        ax.text(v + max(vc.values) * 0.01, i, str(v), va="center",
-                fontsize=9, fontproperties=font)
-    if font:
-        for label in ax.get_xticklabels() + ax.get_yticklabels():
-            label.set_fontproperties(font)
     ax.spines["top"].set_visible(False)
     ax.spines["right"].set_visible(False)
-    ax.set_xlim(0, max(vc.values) * 1.12)
-    fig.tight_layout()
-    fig.savefig(outpath, dpi=300, bbox_inches="tight")
+    t.artists = (bars, texts)
+    return t
 
 
-def save_line(df, time_col, y_col, outpath, font=None):
-    plt.close("all")
-    fig, ax = plt.subplots(figsize=(12, 6))
-    d = df[[time_col, y_col]].copy()
-    d[time_col] = pd.to_datetime(d[time_col], errors="coerce")
-    d = d.dropna().sort_values(time_col)
-    ax.plot(d[time_col], d[y_col])
+def _plot_bar_topk(vc, col, outpath, k=20, font=None, profile=None):
+    # Truncate long labels to 15 chars
+    labels = [s if len(s) <= 15 else s[:14] + "…" for s in vc.index.astype(str)]
+    t = _template(("bar", len(vc), font), lambda: _bar_template(len(vc), font))
+    ax = t.ax
+    bars, texts = t.artists
+    top = max(vc.values, default=0) or 1
+    for i, (rect, text, v) in enumerate(zip(bars, texts, vc.values)):
+        rect.set_width(v)
+        text.set_position((v + top * 0.01, i))
+        text.set_text(str(v))
+    ax.set_yticklabels(labels)
+    ax.set_title(f"Top {k} 类别频数: {col}" if font else f"Top {k} categories: {col}",
+                 fontproperties=font)
+    error = vc.attrs.get("error", 0)
+    if error:
+        # Sketched counts are lower bounds
+        ax.set_xlabel(f"Count (下界，误差 ≤ {error:,})" if font else f"Count (lower bound, error ≤ {error:,})",
+                      fontproperties=font)
+    else:
+        ax.set_xlabel("Count", fontproperties=font)
+    ax.set_ylabel(col, fontproperties=font)
+    ax.set_xlim(0, top * 1.12)
+    t.save(outpath, profile)
+
+
+def save_bar_topk(df, col, outpath, k=20, font=None, profile=None):
+    _plot_bar_topk(topk_counts(df[col], k), col, outpath, k=k, font=font, profile=profile)
+
+
+def _plot_line(x, y, time_col, y_col, outpath, ymin=None, ymax=None, font=None, profile=None):
+    profile = get_profile(profile)
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    width = int(fig.get_figwidth() * profile.dpi)
+    if ymin is not None:
+        # Resampled trend: bucket means with their min-max range
+        ax.fill_between(x, ymin, ymax, alpha=0.35, linewidth=0)
+        ax.plot(x, y, linewidth=1)
+    elif len(x) > 2 * width:
+        # More points than pixel columns: draw each column's min-max range and mean
+        xc, lo, hi, mean = line_pixels(x, y, width)
+        ax.fill_between(xc, lo, hi, alpha=0.35, linewidth=0)
+        ax.plot(xc, mean, linewidth=1)
+    else:
+        ax.plot(x, y)
     ax.set_title(f"时间趋势: {y_col} vs {time_col}" if font else f"Trend: {y_col} vs {time_col}",
                  fontproperties=font)
     ax.set_xlabel(time_col, fontproperties=font)
@@ -129,59 +303,93 @@ def save_line(df, time_col, y_col, outpath, font=None):
         for label in ax.get_xticklabels() + ax.get_yticklabels():
             label.set_fontproperties(font)
     fig.tight_layout()
-    fig.savefig(outpath, dpi=300, bbox_inches="tight")
+    profile.save(fig, outpath)
 
 
-def save_corr_heatmap(df, numeric_cols, outpath, font=None):
-    if len(numeric_cols) < 2:
-        return False
-    plt.close("all")
-    fig, ax = plt.subplots(figsize=(10, 8))
-    corr = df[numeric_cols].corr(numeric_only=True)
+def save_line(df, time_col, y_col, outpath, font=None, profile=None):
+    x, y, ymin, ymax = trend_points(df, time_col, y_col)
+    _plot_line(x, y, time_col, y_col, outpath, ymin, ymax, font=font, profile=profile)
+
+
+def _plot_corr_heatmap(corr, outpath, font=None, profile=None):
+    cols = list(corr.columns)
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
     im = ax.imshow(corr.values)
-    ax.set_xticks(range(len(numeric_cols)))
-    ax.set_yticks(range(len(numeric_cols)))
-    ax.set_xticklabels(numeric_cols, rotation=45, ha="right", fontproperties=font)
-    ax.set_yticklabels(numeric_cols, fontproperties=font)
+    ax.set_xticks(range(len(cols)))
+    ax.set_yticks(range(len(cols)))
+    ax.set_xticklabels(cols, rotation=45, ha="right", fontproperties=font)
+    ax.set_yticklabels(cols, fontproperties=font)
     ax.set_title("相关系数热力图" if font else "Correlation heatmap",
                  fontproperties=font)
     fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
     fig.tight_layout()
-    fig.savefig(outpath, dpi=300, bbox_inches="tight")
+    get_profile(profile).save(fig, outpath)
+
+
+def save_corr_heatmap(df, numeric_cols, outpath, font=None, profile=None):
+    if len(numeric_cols) < 2:
+        return False
+    corr = df[numeric_cols].corr(numeric_only=True)
+    _plot_corr_heatmap(corr, outpath, font=font, profile=profile)
     return True
 
 
-def quick_outliers_iqr(df, col):
-    s = df[col].dropna()
-    if s.empty:
+# Per-process font used by render workers, set once by _init_render_worker
+_WORKER_FONT = None
+
+
+def _init_render_worker(font, rc):
+    global _WORKER_FONT
+    _WORKER_FONT = font
+    matplotlib.rcParams.update(rc)
+
+
+def _render_task(task):
+    plot, args, kwargs = task
+    plot(*args, font=_WORKER_FONT, **kwargs)
+
+
+def render_charts(tasks, font=None, jobs=1):
+    """Render ``(plot_fn, args, kwargs)`` chart tasks, in parallel if ``jobs > 1``.
+
+    Each task only carries the small, pre-aggregated data its chart needs.
+    Workers get the font and rcParams once, at start-up.
+    """
+    if jobs <= 1 or len(tasks) <= 1:
+        for plot, args, kwargs in tasks:
+            plot(*args, font=font, **kwargs)
+        return
+    rc = {"axes.unicode_minus": matplotlib.rcParams["axes.unicode_minus"]}
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)),
+                             initializer=_init_render_worker,
+                             initargs=(font, rc)) as pool:
+        # list() re-raises the first worker exception, if any
+        list(pool.map(_render_task, tasks))
+
+
+def quick_outliers_iqr(df, col, method="exact"):
+    """IQR outlier summary for ``df[col]``; ``method`` is "exact" or "sketch"."""
+    s = df[col]
+    n = s.count()
+    if n == 0:
         return None
-    q1 = s.quantile(0.25)
-    q3 = s.quantile(0.75)
-    iqr = q3 - q1
-    lo = q1 - 1.5 * iqr
-    hi = q3 + 1.5 * iqr
-    out = s[(s < lo) | (s > hi)]
-    return {"q1": float(q1), "q3": float(q3), "iqr": float(iqr),
-            "low": float(lo), "high": float(hi),
-            "outlier_count": int(out.shape[0]),
-            "outlier_ratio": float(out.shape[0] / max(1, s.shape[0]))}
-
-
-def write_report_md(
-    df: pd.DataFrame,
-    roles: dict,
-    charts: list[tuple[str, str]],
-    outliers: dict,
-    group_summaries: list[str],
-    outpath: str,
-):
+    q1, _, q3, err = column_quartiles(s, method)
+    return iqr_summary(s, q1, q3, n=n, rank_error=err)
+
+
+def write_report_md(stats: ProfileStats, charts: list[tuple[str, str]], outpath: str):
+    """Write the markdown report from precomputed ``stats``."""
+    roles = stats.roles
     lines = []
     lines.append("# 自动数据分析报告 (Auto EDA v2)\n")
-    lines.append(f"- 行数: **{df.shape[0]}**\n")
-    lines.append(f"- 列数: **{df.shape[1]}**\n")
+    lines.append(f"- 行数: **{stats.n_rows}**\n")
+    lines.append(f"- 列数: **{stats.n_cols}**\n")
+    if stats.approximate:
+        lines.append("- 模式: 流式分块统计（分位数、直方图、异常值为近似值）\n")
 
     # Missingness
-    miss = df.isna().mean().sort_values(ascending=False)
+    miss = stats.missing.sort_values(ascending=False)
     lines.append("\n## 缺失值概览\n")
     lines.append("|列名|缺失率|\n|---|---|\n")
     for col, r in miss.head(30).items():
@@ -195,25 +403,30 @@ def write_report_md(
     # Numeric summary
     if roles["numeric"]:
         lines.append("\n## 数值字段统计摘要\n")
-        desc = df[roles["numeric"]].describe(percentiles=[0.25, 0.5, 0.75]).T
+        desc = stats.describe
         # Keep it small
         keep = desc[["count", "mean", "std", "min", "25%", "50%", "75%", "max"]].head(30)
         lines.append(keep.to_markdown())
 
         lines.append("\n\n## 异常值（IQR 快速检测）\n")
-        lines.append("|字段|异常数|异常比例|下界|上界|\n|---|---:|---:|---:|---:|\n")
-        for col, info in outliers.items():
+        lines.append("|字段|异常数|异常比例|下界|上界|分位误差界|\n"
+                     "|---|---:|---:|---:|---:|---:|\n")
+        for col, info in stats.outliers.items():
             if not info:
                 continue
             lines.append(
                 f"|{col}|{info['outlier_count']}|{info['outlier_ratio']:.2%}|"
-                f"{info['low']:.3g}|{info['high']:.3g}|\n"
+                f"{info['low']:.3g}|{info['high']:.3g}|±{info.get('rank_error', 0.0):.2%}|\n"
             )
 
-    # Group summaries
-    if group_summaries:
+    # Group summaries: categorical → mean of first 2 numeric, top 15 groups
+    if stats.group_means:
         lines.append("\n## 分组洞察（类别字段 → 数值字段均值）\n")
-        lines.extend(group_summaries)
+        for ccol, g in stats.group_means.items():
+            g = g.sort_values(g.columns[0], ascending=False).head(15)
+            lines.append(f"\n### 按 {ccol} 分组（Top 15）\n")
+            lines.append(g.to_markdown())
+            lines.append("\n")
 
     # Charts
     if charts:
@@ -222,72 +435,319 @@ def write_report_md(
             lines.append(f"### {title}\n\n![]({rel})\n")
 
     # Append bilingual insights
-    lines.extend(generate_bilingual_insights(df, roles, outliers))
+    lines.extend(generate_bilingual_insights(stats))
 
     with open(outpath, "w", encoding="utf-8") as f:
         f.write("\n".join(lines))
 
 
-def run(filepath: str, outdir: str = "eda_output", max_numeric_hists=6, max_cat_bars=4):
-    df = load_data(filepath)
-
-    _ensure_dir(outdir)
-    imgdir = os.path.join(outdir, "images")
-    _ensure_dir(imgdir)
-
-    font = _set_chinese_font()
-    roles = infer_column_roles(df)
-
+def _chart_tasks(stats, imgdir, outdir, profile=None):
+    """Report chart entries and render tasks for everything ``stats`` covers."""
     charts = []
-    outliers = {}
-
-    # Numeric hists
-    for col in roles["numeric"][:max_numeric_hists]:
-        out = os.path.join(imgdir, f"hist_{col}.png")
-        save_hist(df, col, out, font=font)
+    tasks = []
+    roles = stats.roles
+    profile = get_profile(profile)
+    ext = profile.ext
+
+    # Numeric hists (all-missing columns have nothing to chart)
+    for col, (counts, edges) in stats.hists.items():
+        if not np.sum(counts):
+            continue
+        out = os.path.join(imgdir, f"hist_{col}{ext}")
+        tasks.append((_plot_hist, (counts, edges, col, out), {"profile": profile}))
         charts.append((f"直方图：{col}", os.path.relpath(out, outdir)))
-        outliers[col] = quick_outliers_iqr(df, col)
 
     # Categorical bar top-k
-    for col in roles["categorical"][:max_cat_bars]:
-        out = os.path.join(imgdir, f"bar_{col}.png")
-        save_bar_topk(df, col, out, k=20, font=font)
-        charts.append((f"Top 类别：{col}", os.path.relpath(out, outdir)))
-
-    # Time trend: pick first datetime + first numeric
-    if roles["datetime"] and roles["numeric"]:
-        tcol = roles["datetime"][0]
-        ycol = roles["numeric"][0]
-        out = os.path.join(imgdir, f"trend_{ycol}_by_{tcol}.png")
-        save_line(df, tcol, ycol, out, font=font)
+    for col, vc in stats.value_counts.items():
+        if vc.empty:
+            continue
+        out = os.path.join(imgdir, f"bar_{col}{ext}")
+        tasks.append((_plot_bar_topk, (vc, col, out), {"k": 20, "profile": profile}))
+        error = vc.attrs.get("error", 0)
+        title = f"Top 类别：{col}" + (f"（近似计数，误差 ≤ {error:,}）" if error else "")
+        charts.append((title, os.path.relpath(out, outdir)))
+
+    # Time trend: first datetime + first numeric
+    if stats.trend is not None:
+        tcol, ycol, x, y, ymin, ymax = stats.trend
+        out = os.path.join(imgdir, f"trend_{ycol}_by_{tcol}{ext}")
+        # The output path stays the last positional argument (see _chart_spec)
+        tasks.append((_plot_line, (x, y, tcol, ycol, out),
+                      {"ymin": ymin, "ymax": ymax, "profile": profile}))
         charts.append((f"趋势图：{ycol} vs {tcol}", os.path.relpath(out, outdir)))
 
     # Corr heatmap
-    if roles["numeric"]:
-        out = os.path.join(imgdir, "corr_heatmap.png")
-        ok = save_corr_heatmap(df, roles["numeric"][:12], out, font=font)
-        if ok:
-            charts.append(("相关性热力图（前 12 个数值列）", os.path.relpath(out, outdir)))
-
-    # Group summaries: for first 2 categorical, group by and show mean of first 2 numeric
-    group_summaries = []
-    if roles["categorical"] and roles["numeric"]:
-        num_cols = roles["numeric"][:2]
-        for ccol in roles["categorical"][:2]:
-            g = df.groupby(ccol)[num_cols].mean(numeric_only=True).sort_values(num_cols[0], ascending=False).head(15)
-            group_summaries.append(f"\n### 按 {ccol} 分组（Top 15）\n")
-            group_summaries.append(g.to_markdown())
-            group_summaries.append("\n")
+    if len(roles["numeric"]) >= 2:
+        out = os.path.join(imgdir, f"corr_heatmap{ext}")
+        top = roles["numeric"][:12]
+        tasks.append((_plot_corr_heatmap, (stats.corr.loc[top, top], out), {"profile": profile}))
+        charts.append(("相关性热力图（前 12 个数值列）", os.path.relpath(out, outdir)))
+
+    return charts, tasks
+
+
+def _profile_chunks(chunks):
+    """Fold an iterator of DataFrame chunks into a ``StreamProfile``.
+
+    Roles are inferred on the first chunk; see ``StreamProfile`` for how far
+    each section may deviate from the in-memory report.
+    """
+    first = next(chunks, None)
+    if first is None:
+        raise ValueError("No rows to profile")
+
+    first_roles = infer_column_roles(first)
+    profile = StreamProfile(
+        first.columns, first_roles["numeric"], first_roles["datetime"],
+        first_roles["categorical"] + [c for c in first.columns if c in first_roles["id_like"]],
+    )
+    profile.update(first)
+    del first
+    for chunk in chunks:
+        profile.update(chunk)
+    return profile
+
+
+def _stream_stats(filepath, max_numeric_hists, max_cat_bars, chunksize, encoding=None,
+                  parse_salary=True, columns=None, sheet_name=0, max_depth=None):
+    """Build ``ProfileStats`` chunk by chunk; memory is bounded by ``chunksize``."""
+    profile = _profile_chunks(iter_chunks(filepath, chunksize=chunksize, encoding=encoding,
+                                          parse_salary=parse_salary, columns=columns,
+                                          sheet_name=sheet_name, max_depth=max_depth))
+    return profile.to_stats(max_numeric_hists=max_numeric_hists, max_cat_bars=max_cat_bars)
+
+
+def _update_range(profile, filepath, start, end, enc, salary, chunksize):
+    """Fold the headerless CSV rows in bytes ``[start, end)`` into ``profile``."""
+    as_text = {c: str for c in [*profile.text, *salary]}
+    for chunk in iter_salary_parsed(
+            iter_csv_range(filepath, start, end, enc, chunksize=chunksize,
+                           names=profile.columns, dtype=as_text), salary):
+        profile.update(chunk)
+
+
+def _incremental_stats(filepath, state_path, max_numeric_hists, max_cat_bars, chunksize,
+                       encoding=None, parse_salary=True):
+    """Update the saved ``StreamProfile`` with rows appended since the last run.
+
+    Only bytes after the previously processed offset are parsed; if the file
+    was rewritten rather than appended to, the profile is rebuilt from scratch.
+    The state only ever covers complete (newline-terminated) rows; a final
+    row without a newline is added to a copy for this run's report and
+    parsed again next time.
+    """
+    if is_dataset(filepath) or not filepath.lower().endswith(".csv"):
+        raise ValueError("Incremental mode supports append-only CSV files")
+    size = os.path.getsize(filepath)
+    end = csv_row_boundary(filepath)
+    state = load_state(state_path, filepath)
+    if state is None:
+        enc = encoding or detect_encoding(filepath)[0]
+        chunks = iter_csv_range(filepath, 0, end, enc, chunksize=chunksize)
+        first = next(chunks, None)
+        if first is None:
+            raise ValueError("No rows to profile")
+        salary = detect_salary_columns(first) if parse_salary else []
+        profile = _profile_chunks(iter_salary_parsed(itertools.chain([first], chunks), salary))
+    else:
+        enc, profile, salary = state["encoding"], state["profile"], state["salary_columns"]
+        if end > state["offset"]:
+            _update_range(profile, filepath, state["offset"], end, enc, salary, chunksize)
+    save_state(state_path, filepath, profile, end, enc, salary_columns=salary)
+    if size > end:
+        profile = copy.deepcopy(profile)
+        _update_range(profile, filepath, end, size, enc, salary, chunksize)
+    return profile.to_stats(max_numeric_hists=max_numeric_hists, max_cat_bars=max_cat_bars)
+
+
+def run(filepath: str, outdir: str = "eda_output", max_numeric_hists=6, max_cat_bars=4,
+        stream=False, chunksize=200_000, encoding=None, jobs=1, cache=True, cache_dir=None,
+        incremental=False, state_path=None, quantile_method="exact", parse_salary=True,
+        compact=False, columns=None, engine="c", sheet_name=0, max_depth=None,
+        backend="pandas", output_profile="print", chart_format=None):
+    """Profile ``filepath`` and write ``report.md`` + charts into ``outdir``.
+
+    ``filepath`` may also be a directory, glob pattern or list of files,
+    profiled as one dataset (see ``load_data.load_dataset``).
+
+    With ``cache`` the computed ``ProfileStats`` are stored on disk, keyed by
+    the file's content hash and the profiling options, so re-running on the
+    same data (e.g. with another ``outdir`` or export format) only re-renders.
+
+    With ``incremental`` (append-only CSV) the mergeable streaming state is
+    kept in ``state_path`` (default ``<outdir>/eda_state.pkl``) and each run
+    only parses the rows appended since the previous one.
+
+    ``quantile_method`` ("exact" or "sketch") selects how in-memory quartiles
+    and IQR fences are computed; streaming modes always use sketches.
+
+    With ``parse_salary`` salary string columns ("6千/月", "0.8" + "1万/月")
+    are converted to yuan per month at load time and profiled as numeric.
+    ``compact`` shrinks the in-memory frame's dtypes (see ``compact_frame``)
+    before profiling.
+
+    ``columns`` restricts the run to those columns; the readers skip the
+    others (Parquet does not even read their bytes). ``engine="pyarrow"``
+    parses in-memory CSV input on all cores. ``sheet_name`` picks the Excel
+    worksheet (position or name); ``max_depth`` limits how many levels of
+    nested JSON become columns.
+
+    ``backend="duckdb"`` pushes every aggregation down to DuckDB, which
+    streams the file (CSV / JSON / Parquet, globs and Hive trees included)
+    so data far larger than RAM can be profiled; see
+    ``duckdb_profile.duckdb_stats``.
+
+    ``output_profile`` ("draft", "screen", "web" or "print") sets the charts'
+    dpi, format, PNG compression and cropping; ``chart_format`` ("png",
+    "webp", "svg") overrides its file format. See ``output_profiles``. SVG
+    and WebP charts are only rasterized if a Word/PDF export asks for them.
+    """
+    stats = key = None
+    profile = get_profile(output_profile, chart_format)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend!r} (expected one of {BACKENDS})")
+    if incremental and backend != "pandas":
+        raise ValueError("Incremental mode needs the pandas backend")
+    if incremental and columns is not None:
+        raise ValueError("Incremental mode profiles every column; drop columns=")
+    if incremental:
+        state_path = state_path or os.path.join(outdir, "eda_state.pkl")
+        stats = _incremental_stats(filepath, state_path, max_numeric_hists, max_cat_bars,
+                                   chunksize, encoding=encoding, parse_salary=parse_salary)
+    elif cache:
+        config = {"max_numeric_hists": max_numeric_hists, "max_cat_bars": max_cat_bars,
+                  "stream": stream, "chunksize": chunksize if stream else None,
+                  "encoding": encoding, "quantile_method": None if stream else quantile_method,
+                  "parse_salary": parse_salary, "compact": compact and not stream,
+                  "columns": list(columns) if columns is not None else None,
+                  "engine": None if stream else engine, "sheet_name": sheet_name,
+                  "max_depth": max_depth, "backend": backend}
+        key = cache_key(filepath, config, cache_dir)
+        stats = load_cached(key, cache_dir)
+
+    if stats is None:
+        if backend == "duckdb":
+            stats = duckdb_stats(filepath, infer_column_roles,
+                                 max_numeric_hists=max_numeric_hists, max_cat_bars=max_cat_bars,
+                                 quantile_method=quantile_method, columns=columns,
+                                 encoding=encoding, parse_salary=parse_salary)
+        elif stream:
+            stats = _stream_stats(filepath, max_numeric_hists, max_cat_bars, chunksize,
+                                  encoding=encoding, parse_salary=parse_salary,
+                                  columns=columns, sheet_name=sheet_name, max_depth=max_depth)
+        else:
+            df = load_data(filepath, encoding=encoding, parse_salary=parse_salary,
+                           compact=compact, columns=columns, engine=engine,
+                           sheet_name=sheet_name, max_depth=max_depth)
+            for col, d in df.attrs.get("schema_drift", {}).items():
+                print(f"[WARN] Schema drift in {col!r}: missing from {len(d['missing_from'])} "
+                      f"of {df.attrs['files']} files, dtypes {d['dtypes']}")
+            parsed = {}
+            roles = infer_column_roles(df, parsed=parsed)
+            stats = ProfileStats.from_frame(df, roles, max_numeric_hists=max_numeric_hists,
+                                            max_cat_bars=max_cat_bars,
+                                            quantile_method=quantile_method,
+                                            parsed_dates=parsed)
+            del df, parsed
+        if key:
+            store(key, stats, cache_dir)
+
+    _ensure_dir(outdir)
+    imgdir = os.path.join(outdir, "images")
+    _ensure_dir(imgdir)
+
+    font = _set_chinese_font()
+    charts, tasks = _chart_tasks(stats, imgdir, outdir, profile)
+    render_charts(tasks, font=font, jobs=jobs)
+
+    if not profile.raster:
+        # Keep what each chart was drawn from, so exports can rasterize on demand
+        with open(os.path.join(imgdir, _CHART_SPECS), "w", encoding="utf-8") as f:
+            json.dump({os.path.basename(args[-1]): _chart_spec(plot, args, kwargs)
+                       for plot, args, kwargs in tasks}, f, ensure_ascii=False)
 
     report_path = os.path.join(outdir, "report.md")
-    write_report_md(df, roles, charts, outliers, group_summaries, report_path)
+    write_report_md(stats, charts, report_path)
 
     return report_path
 
 
+# Chart data behind SVG/WebP charts, and the bitmap profile exports redraw them with
+_CHART_SPECS = "charts.json"
+_EXPORT_RASTER = OutputProfile("export", dpi=150)
+# Plot functions by the chart kind recorded in _CHART_SPECS
+_PLOTS = {"hist": _plot_hist, "bar": _plot_bar_topk, "line": _plot_line,
+          "corr": _plot_corr_heatmap}
+
+
+def _to_json(v):
+    """``v`` (array, Series, DataFrame or scalar) as plain JSON data, tagged by type."""
+    if isinstance(v, pd.Series):
+        return {"series": [v.index.astype(str).tolist(), v.tolist()],
+                "name": v.name, "index_name": v.index.name, "attrs": v.attrs}
+    if isinstance(v, pd.DataFrame):
+        return {"frame": [v.index.astype(str).tolist(), v.columns.astype(str).tolist(),
+                          v.to_numpy(dtype=float).tolist()]}
+    if isinstance(v, np.ndarray):
+        if np.issubdtype(v.dtype, np.datetime64):
+            return {"datetime64": np.datetime_as_string(v).tolist()}
+        return {"array": v.tolist()}
+    return v.item() if isinstance(v, np.generic) else v
+
+
+def _from_json(v):
+    if not isinstance(v, dict):
+        return v
+    if "series" in v:
+        index, values = v["series"]
+        s = pd.Series(values, index=pd.Index(index, name=v["index_name"]), name=v["name"])
+        s.attrs.update(v["attrs"])
+        return s
+    if "frame" in v:
+        index, columns, values = v["frame"]
+        return pd.DataFrame(values, index=index, columns=columns, dtype=float)
+    if "datetime64" in v:
+        return np.array(v["datetime64"], dtype="datetime64[ns]")
+    return np.array(v["array"])
+
+
+def _chart_spec(plot, args, kwargs):
+    """JSON-ready record of a render task: chart kind plus its data, minus path and profile."""
+    kind = next(k for k, f in _PLOTS.items() if f is plot)
+    return {"kind": kind, "args": [_to_json(a) for a in args[:-1]],
+            "kwargs": {k: _to_json(v) for k, v in kwargs.items() if k != "profile"}}
+
+
+def rasterize_chart(img_path, profile=_EXPORT_RASTER, font=None):
+    """PNG version of an SVG/WebP chart written by ``run``, drawn on first use.
+
+    ``run`` keeps the small aggregated data behind such charts in
+    ``images/charts.json``; the chart is redrawn from it with ``profile`` into
+    ``images/png/`` and reused while it is newer than the chart. Returns None
+    if the chart has no (readable) saved data.
+    """
+    imgdir, name = os.path.split(img_path)
+    out = os.path.join(imgdir, "png", os.path.splitext(name)[0] + ".png")
+    if os.path.exists(out) and os.path.getmtime(out) >= os.path.getmtime(img_path):
+        return out
+    try:
+        with open(os.path.join(imgdir, _CHART_SPECS), encoding="utf-8") as f:
+            spec = json.load(f)[name]
+        plot = _PLOTS[spec["kind"]]
+        args = [_from_json(a) for a in spec["args"]]
+        kwargs = {k: _from_json(v) for k, v in spec["kwargs"].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    _ensure_dir(os.path.dirname(out))
+    plot(*args, out, font=font, **kwargs, profile=profile)
+    return out
+
+
 def export_to_word(report_md: str, outdir: str = "eda_output"):
     """Export the markdown EDA report to a Word (.docx) file.
 
+    SVG/WebP charts are rasterized on demand (see ``rasterize_chart``).
+
     Args:
         report_md: Path to the markdown report file.
         outdir: Directory where the .docx will be saved.
@@ -304,6 +764,7 @@ def export_to_word(report_md: str, outdir: str = "eda_output"):
         return None
 
     doc = Document()
+    font = None
 
     with open(report_md, "r", encoding="utf-8") as f:
         lines = f.readlines()
@@ -327,7 +788,13 @@ def export_to_word(report_md: str, outdir: str = "eda_output"):
             if m:
                 img_rel = m.group(1)
                 img_path = os.path.join(outdir, img_rel)
-                if os.path.exists(img_path):
+                if img_path.lower().endswith((".svg", ".webp")) and os.path.exists(img_path):
+                    # python-docx embeds bitmaps (PNG/JPEG/...) only
+                    font = font or _set_chinese_font()
+                    img_path = rasterize_chart(img_path, font=font)
+                    if img_path is None:
+                        print(f"[WARN] Skipping {img_rel}: no chart data to rasterize it from")
+                if img_path and os.path.exists(img_path):
                     doc.add_picture(img_path, width=Inches(5.5))
                     last_paragraph = doc.paragraphs[-1]
                     last_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -426,12 +893,13 @@ def export_to_pdf(report_md: str, outdir: str = "eda_output"):
     print("       Install docx2pdf (pip install docx2pdf) or LibreOffice for PDF export.")
     return docx_path
 
-def generate_bilingual_insights(df, roles, outliers):
+def generate_bilingual_insights(stats: ProfileStats):
+    roles, outliers = stats.roles, stats.outliers
     lines = []
     lines.append("\n## 核心洞察 | Key Insights\n")
 
     # 1. Missingness
-    miss = df.isna().mean().sort_values(ascending=False)
+    miss = stats.missing.sort_values(ascending=False)
     top_miss = miss.head(3)
 
     lines.append("### 1️⃣ 缺失值情况 | Missingness\n")
@@ -456,7 +924,7 @@ def generate_bilingual_insights(df, roles, outliers):
 
     # 3. Correlation insight
     if len(roles["numeric"]) >= 2:
-        corr = df[roles["numeric"]].corr(numeric_only=True)
+        corr = stats.corr
         upper = corr.where(np.triu(np.ones(corr.shape), k=1).astype(bool))
         pairs = upper.unstack().dropna().sort_values(ascending=False)
         if not pairs.empty:
@@ -484,12 +952,68 @@ def generate_bilingual_insights(df, roles, outliers):
 if __name__ == "__main__":
     import argparse
     p = argparse.ArgumentParser(description="Auto EDA: one-command exploratory data analysis")
-    p.add_argument("filepath", help="Path to CSV/Excel/JSON/Parquet")
+    p.add_argument("filepath", nargs="+",
+                   help="CSV/Excel/JSON/JSON Lines/Parquet file(s), a directory or a glob "
+                        "pattern (several files are profiled as one dataset)")
     p.add_argument("--outdir", default="eda_output")
     p.add_argument("--word", action="store_true", help="Also export report to Word (.docx)")
     p.add_argument("--pdf", action="store_true", help="Also export report to PDF")
+    p.add_argument("--stream", action="store_true",
+                   help="Read the file in chunks (bounded memory, approximate quantiles)")
+    p.add_argument("--chunksize", type=int, default=200_000, help="Rows per chunk in --stream mode")
+    p.add_argument("--encoding", default=None,
+                   help="Pin the input text encoding (default: sniff from a byte sample)")
+    p.add_argument("--jobs", type=int, default=1,
+                   help="Render charts in N worker processes (default: 1, serial)")
+    p.add_argument("--no-cache", action="store_true",
+                   help="Recompute statistics instead of reusing the on-disk profile cache")
+    p.add_argument("--cache-dir", default=None,
+                   help="Profile cache location (default: ~/.cache/ai-data-analysis-skill/profiles)")
+    p.add_argument("--incremental", action="store_true",
+                   help="Append-only CSV: keep mergeable state and only profile new rows")
+    p.add_argument("--state", default=None,
+                   help="State file for --incremental (default: <outdir>/eda_state.pkl)")
+    p.add_argument("--quantiles", choices=QUANTILE_METHODS, default="exact",
+                   help="Quartile/IQR backend: exact percentiles or a bounded-memory sketch")
+    p.add_argument("--columns", default=None,
+                   help="Comma-separated columns to profile; the rest are never parsed")
+    p.add_argument("--sheet", default="0",
+                   help="Excel worksheet to profile: name, or position (0 = first) if no "
+                        "sheet has that name")
+    p.add_argument("--json-depth", type=int, default=None,
+                   help="Nested JSON levels to flatten into columns (default: all)")
+    p.add_argument("--engine", choices=CSV_ENGINES, default="c",
+                   help="CSV parser: pandas C (single-threaded) or pyarrow (multi-threaded)")
+    p.add_argument("--backend", choices=BACKENDS, default="pandas",
+                   help="Statistics engine: pandas in memory, or DuckDB streaming over the file "
+                        "(out of core, all cores; pip install duckdb)")
+    p.add_argument("--profile", choices=tuple(PROFILES), default="print",
+                   help="Chart output: draft (72 dpi, fast), screen (120 dpi), web (SVG, "
+                        "rasterized only for --word/--pdf) or print (300 dpi)")
+    p.add_argument("--format", choices=FORMATS, default=None,
+                   help="Chart file format (default: the profile's, PNG)")
+    p.add_argument("--compact", action="store_true",
+                   help="Shrink dtypes (category, narrow ints, Arrow strings) before profiling")
+    p.add_argument("--raw-salary", action="store_true",
+                   help="Keep salary strings as text instead of parsing them to yuan/month")
     args = p.parse_args()
-    rp = run(args.filepath, args.outdir)
+    path = args.filepath[0] if len(args.filepath) == 1 else args.filepath
+    sheet = int(args.sheet) if args.sheet.isdigit() else args.sheet
+    if not is_dataset(path) and split_ext(path)[0] in ("xlsx", "xlsm", "xls"):
+        # Sheet names win over positions: --sheet 2024 means the sheet called 2024
+        try:
+            sheet = resolve_sheet(path, args.sheet)
+        except ValueError as e:
+            p.error(str(e))
+    rp = run(path, args.outdir, stream=args.stream, chunksize=args.chunksize,
+             encoding=args.encoding, jobs=args.jobs, cache=not args.no_cache,
+             cache_dir=args.cache_dir, incremental=args.incremental, state_path=args.state,
+             quantile_method=args.quantiles, parse_salary=not args.raw_salary,
+             compact=args.compact,
+             columns=args.columns.split(",") if args.columns else None, engine=args.engine,
+             sheet_name=sheet,
+             max_depth=args.json_depth, backend=args.backend,
+             output_profile=args.profile, chart_format=args.format)
     print(f"[OK] Report saved: {rp}")
     if args.pdf:
         export_to_pdf(rp, args.outdir)
@@ -0,0 +1,65 @@
+"""Benchmark CSV load throughput (rows/sec) of the load_data engines.
+
+The sample job file is scaled up by repeating its rows, written once as
+UTF-8 and once as GBK, then loaded with each engine.
+
+Usage:
+    python scripts/bench_load.py [--copies 50] [--repeat 3] > bench_output.txt
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from load_data import load_data, CSV_ENGINES
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples',
+                      'sample_jobinfo_1000.csv')
+
+
+def make_input(copies, encoding, workdir):
+    """Write the sample repeated ``copies`` times; return ``(path, rows, bytes)``."""
+    df = pd.read_csv(SAMPLE, encoding='utf-8-sig')
+    big = pd.concat([df] * copies, ignore_index=True)
+    path = os.path.join(workdir, f'jobinfo_x{copies}.{encoding}.csv')
+    big.to_csv(path, index=False, encoding=encoding)
+    return path, len(big), os.path.getsize(path)
+
+
+def time_load(path, engine, repeat, encoding):
+    """Best wall time of ``repeat`` loads, and the engine that actually ran."""
+    best, used = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = load_data(path, engine=engine, encoding=encoding)
+        best = min(best, time.perf_counter() - start)
+        used = df.attrs.get('engine')
+        del df
+    return best, used
+
+
+def main(copies=50, repeat=3):
+    print(f"CPU cores: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for encoding in ('utf-8', 'gbk'):
+            path, rows, size = make_input(copies, encoding, workdir)
+            print(f"\n{encoding}: {rows:,} rows, {size / 1e6:.0f} MB")
+            print(f"{'engine':<10}{'seconds':>10}{'rows/sec':>14}{'MB/sec':>10}  used")
+            for engine in CSV_ENGINES:
+                secs, used = time_load(path, engine, repeat, encoding)
+                print(f"{engine:<10}{secs:>10.2f}{rows / secs:>14,.0f}"
+                      f"{size / 1e6 / secs:>10.1f}  {used}")
+
+
+if __name__ == '__main__':
+    import argparse
+    p = argparse.ArgumentParser(description="CSV load benchmark for load_data engines")
+    p.add_argument("--copies", type=int, default=50,
+                   help="Repeat the 1000-row sample this many times (default: 50)")
+    p.add_argument("--repeat", type=int, default=3, help="Timed loads per engine (best is kept)")
+    args = p.parse_args()
+    main(args.copies, args.repeat)
@@ -0,0 +1,311 @@
+"""Out-of-core auto_eda statistics computed by DuckDB.
+
+Every aggregation (missingness, describe, correlations, histogram binning,
+top-k counts, group means, the trend) runs as SQL over the file itself, so
+only small result tables ever reach pandas and the input can be far larger
+than RAM: DuckDB streams CSV / JSON / Parquet (including globs, directories
+and Hive-partitioned trees), reads only the referenced Parquet columns and
+uses every core. Roles are inferred on a reservoir sample, as in memory.
+
+DuckDB is optional (``pip install duckdb``); it is only imported when this
+backend is used.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from load_data import (detect_encoding, detect_salary_columns, expand_paths, is_dataset,
+                       open_input, parse_salary_columns, salary_lookup, split_ext)
+from profile_stats import QUANTILE_METHODS, ProfileStats
+
+
+def _ident(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _float(value):
+    return np.nan if value is None else float(value)
+
+
+# CSV encodings DuckDB decodes without its (downloaded) encodings extension
+_NATIVE_ENCODINGS = ('utf-8', 'utf-16', 'latin-1')
+
+
+def _csv_encoding(filepath, encoding=None):
+    encoding = encoding or detect_encoding(filepath)[0]
+    return {'utf-8-sig': 'utf-8', 'ascii': 'utf-8'}.get(encoding.lower(), encoding.lower())
+
+
+def _readable_csv(filepath, encoding, tmpdir):
+    """``(filepath, encoding)`` DuckDB can read, transcoding other CSV encodings.
+
+    GBK / GB18030 CSV files are streamed once into UTF-8 copies under
+    ``tmpdir`` (decompressed, if they were compressed). Paths stay relative
+    to the dataset root, so Hive ``key=value`` directories still become
+    columns. Other input is returned unchanged.
+    """
+    files = expand_paths(filepath) if is_dataset(filepath) else [filepath]
+    if split_ext(files[0])[0] != 'csv':
+        return filepath, encoding
+    encoding = _csv_encoding(files[0], encoding)
+    if encoding in _NATIVE_ENCODINGS:
+        return filepath, encoding
+    print(f"[WARN] DuckDB cannot decode {encoding} CSV; profiling a temporary UTF-8 copy")
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files])
+    copies = []
+    for f in files:
+        dst = os.path.join(tmpdir, os.path.relpath(os.path.abspath(f), root))
+        if split_ext(f)[1]:
+            dst = os.path.splitext(dst)[0]
+        if not dst.lower().endswith('.csv'):
+            dst += '.csv'
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        with open_input(f) as raw, \
+                io.TextIOWrapper(raw, encoding=encoding, newline='') as src, \
+                open(dst, 'w', encoding='utf-8', newline='') as out:
+            shutil.copyfileobj(src, out, 1 << 20)
+        copies.append(dst)
+    return (copies if is_dataset(filepath) else copies[0]), 'utf-8'
+
+
+def source_sql(filepath, encoding=None):
+    """DuckDB table function reading ``filepath`` (a file, directory, glob or list).
+
+    Files are combined by column name; Hive ``key=value`` directories become
+    columns. CSV input must be UTF-8, UTF-16 or latin-1, and compressed input
+    gzip or zstd, which is what DuckDB decodes natively.
+    """
+    files = expand_paths(filepath) if is_dataset(filepath) else [filepath]
+    formats = {split_ext(f) for f in files}
+    if len({ext for ext, _ in formats}) > 1:
+        raise ValueError(f"Mixed file formats in {filepath}: {sorted(formats)}")
+    ext, codec = formats.pop()
+    if codec not in (None, 'gzip', 'zstd'):
+        raise ValueError(f"The duckdb backend cannot decompress {codec}; use backend='pandas'")
+    paths = '[' + ', '.join(_literal(f) for f in files) + ']'
+
+    if ext == 'parquet':
+        return f"read_parquet({paths}, union_by_name = true)"
+    if ext in ('json', 'jsonl', 'ndjson'):
+        fmt = 'newline_delimited' if ext != 'json' else 'auto'
+        return f"read_json_auto({paths}, format = {_literal(fmt)}, union_by_name = true)"
+    if ext == 'csv':
+        encoding = _csv_encoding(files[0], encoding)
+        return f"read_csv({paths}, encoding = {_literal(encoding)}, union_by_name = true)"
+    raise ValueError(f"The duckdb backend reads CSV, JSON and Parquet, not .{ext}")
+
+
+def _create_source(con, filepath, columns, encoding, parse_salary, sample_size):
+    """Create view ``src`` (salary strings parsed in SQL); return ``(sample, salary)``.
+
+    ``sample`` is a reservoir sample of ``sample_size`` rows, salary-parsed in pandas.
+    """
+    select = '*' if columns is None else ', '.join(_ident(c) for c in columns)
+    con.execute(f"CREATE TEMP VIEW raw AS SELECT {select} FROM {source_sql(filepath, encoding)}")
+    sample = con.sql(f"SELECT * FROM raw USING SAMPLE reservoir({int(sample_size)} ROWS) "
+                     f"REPEATABLE (0)").df()
+
+    salary = detect_salary_columns(sample) if parse_salary else []
+    joins, scales = [], [f"s{i}.scale" for i in range(len(salary))]
+    replace = []
+    for i, col in enumerate(salary):
+        distinct = con.sql(f"SELECT DISTINCT {_ident(col)} FROM raw").fetchnumpy()[col]
+        con.register(f"salary_{i}", salary_lookup(distinct).rename_axis('raw').reset_index())
+        joins.append(f"LEFT JOIN salary_{i} s{i} ON raw.{_ident(col)} = s{i}.raw")
+        # A bare number takes the first unit stated in the row, as in parse_salary_columns
+        shared = ', '.join([f"s{i}.scale", *scales, '1.0'])
+        replace.append(f"s{i}.value * coalesce({shared}) AS {_ident(col)}")
+    star = f"raw.* REPLACE ({', '.join(replace)})" if replace else 'raw.*'
+    con.execute(f"CREATE TEMP VIEW src AS SELECT {star} FROM raw {' '.join(joins)}")
+    return parse_salary_columns(sample, salary), salary
+
+
+def duckdb_stats(filepath, infer_roles, max_numeric_hists=6, max_cat_bars=4, top_k=20,
+                 hist_bins=30, quantile_method="exact", columns=None, encoding=None,
+                 parse_salary=True, sample_size=10_000, group_capacity=4096, id_ratio=0.9,
+                 memory_limit=None):
+    """Build ``ProfileStats`` with DuckDB, without loading the data into pandas.
+
+    Matches ``ProfileStats.from_frame`` section by section, except that:
+
+    - categorical vs id-like uses DuckDB's HyperLogLog distinct estimate,
+      counted exactly only when it is close to the threshold;
+    - top-k ties are ordered by value instead of by first appearance;
+    - group means keep the ``group_capacity`` largest groups;
+    - the trend plots daily means and min/max bands at any size (text dates
+      must be ISO-like for DuckDB to parse them);
+    - CSV in encodings DuckDB cannot decode (GBK, GB18030) is first copied
+      to a temporary UTF-8 file.
+
+    ``quantile_method="sketch"`` uses DuckDB's ``approx_quantile``
+    (T-digest); the quartiles' rank error is then measured exactly in the
+    outlier pass and reported like the in-memory sketch's bound.
+
+    Args:
+        filepath: CSV / JSON / JSON Lines / Parquet file, directory, glob
+            pattern or list of files.
+        infer_roles: ``auto_eda.infer_column_roles``-style function, applied
+            to the sample.
+        columns: Only profile these columns.
+        encoding: CSV encoding (default: sniffed from the first file).
+        parse_salary: Convert salary strings to yuan per month, via a lookup
+            of their distinct values joined in SQL.
+        sample_size: Rows sampled for role inference.
+        memory_limit: DuckDB memory limit, e.g. ``"4GB"``; larger
+            intermediate state spills to disk.
+
+    Returns:
+        The ``ProfileStats`` consumed by the report and charts.
+    """
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("The duckdb backend requires duckdb: pip install duckdb") from e
+    if quantile_method not in QUANTILE_METHODS:
+        raise ValueError(f"Unknown quantile method: {quantile_method!r} "
+                         f"(expected one of {QUANTILE_METHODS})")
+
+    with tempfile.TemporaryDirectory(prefix='eda-duckdb-') as tmpdir, duckdb.connect() as con:
+        filepath, encoding = _readable_csv(filepath, encoding, tmpdir)
+        con.execute("SET enable_progress_bar = false")
+        if memory_limit:
+            con.execute(f"SET memory_limit = {_literal(memory_limit)}")
+        try:
+            sample, _ = _create_source(con, filepath, columns, encoding, parse_salary,
+                                       sample_size)
+        except duckdb.Error as e:
+            raise ValueError(f"DuckDB cannot read {filepath}: {e}") from e
+        roles = infer_roles(sample)
+        cols = list(sample.columns)
+        num_cols = roles["numeric"]
+        text = [c for c in cols if c in roles["categorical"] or c in roles["id_like"]]
+        x = {c: f"CAST({_ident(c)} AS DOUBLE)" for c in num_cols}
+
+        # Pass 1: counts, moments, quartiles, correlations, distinct counts
+        quantile = "quantile_cont" if quantile_method == "exact" else "approx_quantile"
+        aggs = {"n": "count(*)"}
+        aggs.update({("count", c): f"count({_ident(c)})" for c in cols})
+        for c in num_cols:
+            aggs.update({("mean", c): f"avg({x[c]})", ("std", c): f"stddev_samp({x[c]})",
+                         ("min", c): f"min({x[c]})", ("max", c): f"max({x[c]})",
+                         ("q", c): f"{quantile}({x[c]}, [0.25, 0.5, 0.75])"})
+        if len(num_cols) >= 2:
+            aggs.update({("corr", a, b): f"corr({x[a]}, {x[b]})"
+                         for i, a in enumerate(num_cols) for b in num_cols[i + 1:]})
+        aggs.update({("distinct", c): f"approx_count_distinct({_ident(c)})" for c in text})
+        r = dict(zip(aggs, con.sql(f"SELECT {', '.join(aggs.values())} FROM src").fetchone()))
+        n = r["n"]
+        if n == 0:
+            raise ValueError("No rows to profile")
+
+        ratio = {c: r["distinct", c] / n for c in text}
+        # HyperLogLog can be several percent off; count exactly when too close to call
+        close = [c for c in text if abs(ratio[c] - id_ratio) < 0.1]
+        if close:
+            exact = con.sql("SELECT " + ", ".join(f"count(DISTINCT {_ident(c)})" for c in close)
+                            + " FROM src").fetchone()
+            ratio.update({c: d / n for c, d in zip(close, exact)})
+        roles["categorical"] = [c for c in text if ratio[c] <= id_ratio]
+        roles["id_like"] = [c for c in text if ratio[c] > id_ratio]
+        missing = pd.Series({c: 1 - r["count", c] / n for c in cols}, dtype=float)
+        quart = {c: r["q", c] or [None] * 3 for c in num_cols}
+        describe = pd.DataFrame({
+            "count": [r["count", c] for c in num_cols],
+            **{k: [_float(r[k, c]) for c in num_cols] for k in ("mean", "std", "min")},
+            **{q: [_float(quart[c][i]) for c in num_cols]
+               for i, q in enumerate(("25%", "50%", "75%"))},
+            "max": [_float(r["max", c]) for c in num_cols],
+        }, index=num_cols)
+        corr = pd.DataFrame()
+        if len(num_cols) >= 2:
+            corr = pd.DataFrame(np.nan, index=num_cols, columns=num_cols)
+            for i, a in enumerate(num_cols):
+                corr.at[a, a] = 1.0 if r["count", a] else np.nan
+                for b in num_cols[i + 1:]:
+                    corr.at[a, b] = corr.at[b, a] = _float(r["corr", a, b])
+
+        # Pass 2: histogram bins and IQR outliers of the charted columns
+        hists, outliers, aggs = {}, {}, {}
+        bounds = {}
+        for c in num_cols[:max_numeric_hists]:
+            lo, hi = float(describe.at[c, "min"]), float(describe.at[c, "max"])
+            if not r["count", c]:
+                hists[c], outliers[c] = np.histogram([], bins=hist_bins), None
+                continue
+            if lo == hi:
+                lo, hi = lo - 0.5, hi + 0.5  # as np.histogram does
+            q1, q3 = float(describe.at[c, "25%"]), float(describe.at[c, "75%"])
+            low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+            bounds[c] = (lo, hi, q1, q3, low, high)
+            binned = f"floor(({x[c]} - {lo!r}) * {hist_bins / (hi - lo)!r})"
+            # least() skips NULL, so NULLs would land in the last bin without the filter
+            aggs[("hist", c)] = (f"histogram(least(CAST({binned} AS INTEGER), {hist_bins - 1})) "
+                                 f"FILTER (WHERE {x[c]} IS NOT NULL)")
+            aggs[("out", c)] = f"count_if({x[c]} < {low!r} OR {x[c]} > {high!r})"
+            for q in (q1, q3):
+                aggs[("below", c, q)] = f"count_if({x[c]} < {q!r})"
+                aggs[("upto", c, q)] = f"count_if({x[c]} <= {q!r})"
+        if aggs:
+            r2 = dict(zip(aggs, con.sql(f"SELECT {', '.join(aggs.values())} FROM src").fetchone()))
+        for c, (lo, hi, q1, q3, low, high) in bounds.items():
+            counts = np.zeros(hist_bins, dtype=np.int64)
+            for b, k in r2["hist", c].items():
+                counts[b] = k
+            hists[c] = (counts, np.linspace(lo, hi, hist_bins + 1))
+            m = r["count", c]
+            rank_error = 0.0
+            if quantile_method == "sketch":
+                rank_error = max(max(0.0, r2["below", c, q] / m - p, p - r2["upto", c, q] / m)
+                                 for p, q in ((0.25, q1), (0.75, q3)))
+            count = int(r2["out", c])
+            outliers[c] = {"q1": float(q1), "q3": float(q3), "iqr": float(q3 - q1),
+                           "low": float(low), "high": float(high),
+                           "outlier_count": count, "outlier_ratio": float(count / max(1, m)),
+                           "rank_error": float(rank_error)}
+
+        # Top-k values and group means: one grouped query per charted column
+        value_counts = {}
+        for c in roles["categorical"][:max_cat_bars]:
+            # Positional GROUP / ORDER BY: an alias could shadow a source column
+            v = con.sql(f"SELECT CAST({_ident(c)} AS VARCHAR) AS __v, count(*) AS __n FROM src "
+                        f"WHERE {_ident(c)} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC, 1 "
+                        f"LIMIT {int(top_k)}").df()
+            vc = pd.Series(v["__n"].to_numpy(), index=pd.Index(v["__v"].astype(str), name=c),
+                           name="count")
+            vc.attrs["error"] = 0
+            value_counts[c] = vc
+
+        group_means = {}
+        if roles["categorical"] and num_cols:
+            ycols = num_cols[:2]
+            means = ', '.join(f"avg({x[y]}) AS {_ident(y)}" for y in ycols)
+            for c in roles["categorical"][:2]:
+                g = con.sql(f"SELECT {_ident(c)}, {means} FROM src WHERE {_ident(c)} IS NOT NULL "
+                            f"GROUP BY {_ident(c)} ORDER BY count(*) DESC "
+                            f"LIMIT {int(group_capacity)}").df()
+                group_means[c] = g.set_index(c).sort_index()
+
+        trend = None
+        if roles["datetime"] and num_cols:
+            tcol, ycol = roles["datetime"][0], num_cols[0]
+            cast = "CAST" if pd.api.types.is_datetime64_any_dtype(sample[tcol]) else "TRY_CAST"
+            day = f"date_trunc('day', {cast}({_ident(tcol)} AS TIMESTAMP))"
+            d = con.sql(f"SELECT {day} AS __t, avg({x[ycol]}) AS __y, min({x[ycol]}) AS __lo, "
+                        f"max({x[ycol]}) AS __hi FROM src "
+                        f"WHERE {x[ycol]} IS NOT NULL AND {day} IS NOT NULL "
+                        f"GROUP BY 1 ORDER BY 1").df()
+            trend = (tcol, ycol, *(d[c].to_numpy() for c in ("__t", "__y", "__lo", "__hi")))
+
+    return ProfileStats(n_rows=n, columns=cols, roles=roles, missing=missing,
+                        describe=describe, corr=corr, hists=hists, outliers=outliers,
+                        value_counts=value_counts, group_means=group_means, trend=trend,
+                        approximate=quantile_method == "sketch")
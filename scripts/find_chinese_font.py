@@ -1,47 +1,134 @@
 """Auto-detect and load a Chinese font for matplotlib on any OS."""
 
+import hashlib
+import json
 import os
 import matplotlib.font_manager as fm
 
+CANDIDATES = [
+    # Windows
+    'C:/Windows/Fonts/msyh.ttc',
+    'C:/Windows/Fonts/msyhbd.ttc',
+    'C:/Windows/Fonts/simhei.ttf',
+    'C:/Windows/Fonts/simsun.ttc',
+    # Linux
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc',
+    '/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf',
+    # macOS
+    '/System/Library/Fonts/PingFang.ttc',
+    '/System/Library/Fonts/Hiragino Sans GB.ttc',
+    '/Library/Fonts/Arial Unicode.ttf',
+]
 
-def find_chinese_font():
-    """Find a Chinese font available on the current system.
+KEYWORDS = ['yahei', 'simhei', 'simsun', 'noto', 'pingfang', 'cjk',
+            'wqy', 'heiti', 'songti', 'fangsong']
 
-    Returns:
-        FontProperties object or None if no Chinese font found.
-    """
-    candidates = [
-        # Windows
-        'C:/Windows/Fonts/msyh.ttc',
-        'C:/Windows/Fonts/msyhbd.ttc',
-        'C:/Windows/Fonts/simhei.ttf',
-        'C:/Windows/Fonts/simsun.ttc',
-        # Linux
-        '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
-        '/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc',
-        '/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf',
-        # macOS
-        '/System/Library/Fonts/PingFang.ttc',
-        '/System/Library/Fonts/Hiragino Sans GB.ttc',
-        '/Library/Fonts/Arial Unicode.ttf',
-    ]
-
-    for path in candidates:
+# Process-level memo: unset until the first lookup, then a path or None
+_UNSET = object()
+_font_path = _UNSET
+
+
+def _cache_file():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ai-data-analysis-skill', 'chinese_font.json')
+
+
+def _font_dirs():
+    dirs = (fm.X11FontDirectories + fm.OSXFontDirectories + fm.MSUserFontDirectories
+            + [os.path.dirname(p) for p in CANDIDATES])
+    return sorted({os.path.normpath(d) for d in dirs})
+
+
+def _fingerprint():
+    """Hash of (path, mtime, size) for every font directory and its direct
+    subdirectories. Installing or removing a font changes one of these."""
+    h = hashlib.sha1()
+    for d in _font_dirs():
+        try:
+            entries = [d] + [e.path for e in os.scandir(d) if e.is_dir()]
+        except OSError:
+            continue
+        for path in sorted(entries):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            h.update(f'{path}|{st.st_mtime_ns}|{st.st_size}\n'.encode())
+    return h.hexdigest()
+
+
+def _search():
+    for path in CANDIDATES:
         if os.path.exists(path):
-            return fm.FontProperties(fname=path)
+            return path
 
     # Fallback: search system fonts by keyword
-    keywords = ['yahei', 'simhei', 'simsun', 'noto', 'pingfang', 'cjk',
-                'wqy', 'heiti', 'songti', 'fangsong']
     for font_path in fm.findSystemFonts():
-        if any(kw in font_path.lower() for kw in keywords):
-            return fm.FontProperties(fname=font_path)
+        if any(kw in font_path.lower() for kw in KEYWORDS):
+            return font_path
 
     return None
 
 
+def _resolve_font_path():
+    """Font path from the on-disk cache if the font dirs are unchanged,
+    otherwise from a fresh search (which is then written to the cache)."""
+    fingerprint = _fingerprint()
+    cache = _cache_file()
+    try:
+        with open(cache, encoding='utf-8') as f:
+            cached = json.load(f)
+        path = cached['path']
+        if cached['fingerprint'] == fingerprint and (path is None or os.path.exists(path)):
+            return path
+    except (OSError, ValueError, KeyError):
+        pass
+
+    path = _search()
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with open(cache, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'path': path}, f)
+    except OSError:
+        pass  # read-only home: fall back to the in-process memo only
+    return path
+
+
+def clear_font_cache():
+    """Forget the memoized font and delete the on-disk cache."""
+    global _font_path
+    _font_path = _UNSET
+    try:
+        os.remove(_cache_file())
+    except OSError:
+        pass
+
+
+def find_chinese_font(refresh=False):
+    """Find a Chinese font available on the current system.
+
+    The result is memoized per process and cached on disk, keyed by a
+    fingerprint of the font directories, so only the first call after a font
+    is installed or removed walks the font directories.
+
+    Args:
+        refresh: Ignore both caches and search again.
+
+    Returns:
+        FontProperties object or None if no Chinese font found.
+    """
+    global _font_path
+    if refresh:
+        clear_font_cache()
+    if _font_path is _UNSET:
+        _font_path = _resolve_font_path()
+    return fm.FontProperties(fname=_font_path) if _font_path else None
+
+
 if __name__ == '__main__':
-    font = find_chinese_font()
+    import sys
+    font = find_chinese_font(refresh='--refresh' in sys.argv)
     if font:
         print(f"Found Chinese font: {font.get_file()}")
     else:
@@ -0,0 +1,70 @@
+"""Persisted StreamProfile state for incremental EDA on append-only CSV files."""
+
+import hashlib
+import os
+import pickle
+
+# Bump when StreamProfile's pickled layout changes
+STATE_VERSION = 2
+_PROBE = 1 << 16
+
+
+def _digest_range(filepath, start, end):
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        return hashlib.blake2b(f.read(end - start), digest_size=16).hexdigest()
+
+
+def _prefix_fingerprint(filepath, offset):
+    """Hashes of the first block and of the block just before ``offset``.
+
+    Appending rows leaves both unchanged; rewriting or truncating the file
+    almost always changes one of them. Cost is independent of file size.
+    """
+    return (_digest_range(filepath, 0, min(offset, _PROBE)),
+            _digest_range(filepath, max(0, offset - _PROBE), offset))
+
+
+def load_state(state_path, filepath):
+    """Saved state for ``filepath``, or None if absent, stale or not a prefix.
+
+    The state is only reused when the bytes it was built from are still the
+    start of the file (i.e. the file was appended to, not rewritten).
+    """
+    try:
+        with open(state_path, 'rb') as f:
+            state = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if state.get('version') != STATE_VERSION:
+        return None
+    if state['path'] != os.path.abspath(filepath):
+        return None
+    offset = state['offset']
+    if os.path.getsize(filepath) < offset:
+        return None
+    if _prefix_fingerprint(filepath, offset) != state['fingerprint']:
+        return None
+    return state
+
+
+def save_state(state_path, filepath, profile, offset, encoding, salary_columns=()):
+    """Persist ``profile`` as covering bytes ``[0, offset)`` of ``filepath``.
+
+    ``salary_columns`` lists the columns parsed as salaries, so appended rows
+    are converted the same way.
+    """
+    state = {
+        'version': STATE_VERSION,
+        'path': os.path.abspath(filepath),
+        'offset': offset,
+        'encoding': encoding,
+        'salary_columns': list(salary_columns),
+        'fingerprint': _prefix_fingerprint(filepath, offset),
+        'profile': profile,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+    tmp = state_path + '.tmp'
+    with open(tmp, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, state_path)
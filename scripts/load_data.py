@@ -1,55 +1,1142 @@
 """Load data files with automatic encoding detection and format handling."""
 
+import codecs
+import contextlib
+import glob
+import importlib.util
+import io
+import json
+import operator
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 
+ENCODINGS = ['utf-8-sig', 'utf-8', 'gbk', 'gb2312', 'gb18030', 'latin-1']
+
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+# Compression suffix -> codec; pyarrow names where pyarrow does the work
+_CODECS = {'gz': 'gzip', 'gzip': 'gzip', 'bz2': 'bz2', 'xz': 'xz',
+           'zst': 'zstd', 'zstd': 'zstd', 'zip': 'zip'}
+
+
+def _zip_member(filepath):
+    """Name of the single data file inside a .zip archive."""
+    with zipfile.ZipFile(filepath) as zf:
+        names = [n for n in zf.namelist()
+                 if not n.endswith('/') and not n.startswith('__MACOSX/')]
+    if len(names) != 1:
+        raise ValueError(f"Expected one data file in {filepath}, found {len(names)}: {names[:5]}")
+    return names[0]
+
+
+def split_ext(filepath):
+    """``(format extension, codec)`` of a possibly compressed file.
+
+    ``data.csv.gz`` gives ``('csv', 'gzip')``, ``data.csv`` gives
+    ``('csv', None)``; for a ``.zip`` the format comes from the file inside.
+    """
+    parts = os.path.basename(filepath).lower().split('.')
+    ext = parts[-1] if len(parts) > 1 else ''
+    codec = _CODECS.get(ext)
+    if codec == 'zip':
+        return _zip_member(filepath).lower().rsplit('.', 1)[-1], codec
+    if codec:
+        return (parts[-2] if len(parts) > 2 else ''), codec
+    return ext, None
+
+
+@contextlib.contextmanager
+def open_input(filepath):
+    """Binary stream over the file's content, decompressed on the fly.
+
+    Nothing is written to disk: gzip, bz2 and zstd are decoded by pyarrow's
+    streaming codecs, xz by ``lzma``, and a .zip member is read straight
+    from the archive. Decompression of a single stream is sequential (a
+    zstd frame cannot be split across threads), but it runs in native code
+    ahead of the parser.
+    """
+    codec = split_ext(filepath)[1]
+    if codec is None:
+        with open(filepath, 'rb') as f:
+            yield f
+    elif codec == 'zip':
+        with zipfile.ZipFile(filepath) as zf, zf.open(_zip_member(filepath)) as f:
+            yield f
+    elif codec == 'xz':
+        import lzma
+        with lzma.open(filepath, 'rb') as f:
+            yield f
+    else:
+        import pyarrow as pa
+        with pa.input_stream(filepath, compression=codec) as f:
+            yield f
+
+
+def _sample_blocks(filepath, sample_size):
+    """Read up to ``sample_size`` bytes: the head, plus middle and tail blocks
+    for larger files (bad bytes are often near the end of legacy exports).
+    Compressed files only offer their decompressed head."""
+    if split_ext(filepath)[1]:
+        with open_input(filepath) as f:
+            head = f.read(sample_size + 1)
+        return [head[:sample_size]], len(head) <= sample_size
+    size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as f:
+        if size <= sample_size:
+            return [f.read()], True
+        head = f.read(sample_size // 2)
+        blocks = [head]
+        for offset in (size // 2, size - sample_size // 4):
+            f.seek(offset)
+            blocks.append(f.read(sample_size // 4))
+        return blocks, False
+
+
+def _decodes(blocks, encoding):
+    """Decode every block strictly; return the text, or None on a bad byte.
+
+    Blocks after the head may start mid-character, so up to 3 leading bytes
+    are skipped; a character cut off at a block end is tolerated.
+    """
+    texts = []
+    for i, block in enumerate(blocks):
+        for skip in ((0,) if i == 0 else (0, 1, 2, 3)):
+            try:
+                decoder = codecs.getincrementaldecoder(encoding)()
+                texts.append(decoder.decode(block[skip:], final=False))
+                break
+            except UnicodeDecodeError:
+                continue
+        else:
+            return None
+    return ''.join(texts)
+
+
+def _cjk_share(text):
+    """Share of non-ASCII characters that are CJK ideographs or CJK punctuation."""
+    wide = [ch for ch in text if ord(ch) > 0x7F]
+    if not wide:
+        return 0.0
+    cjk = sum(1 for ch in wide if '\u4e00' <= ch <= '\u9fff'
+              or '\u3000' <= ch <= '\u303f' or '\uff00' <= ch <= '\uffef')
+    return cjk / len(wide)
+
+
+def detect_encoding(filepath, sample_size=1 << 20):
+    """Guess a text file's encoding from a bounded byte sample.
+
+    Checks for a BOM, then strict UTF-8 validity, then GBK / GB18030 (scored by
+    how much of the decoded text is CJK), and falls back to latin-1.
+
+    Args:
+        filepath: Path to the text file.
+        sample_size: Maximum number of bytes inspected.
+
+    Returns:
+        Tuple ``(encoding, confidence)`` with confidence in [0, 1]. A
+        confidence of 1.0 means the whole file was checked.
+    """
+    blocks, whole = _sample_blocks(filepath, sample_size)
+    head = blocks[0]
+    for bom, enc in _BOMS:
+        if head.startswith(bom):
+            return enc, 1.0
+
+    # Anything short of scanning the whole file leaves some doubt
+    sure = 1.0 if whole else 0.95
+    if all(b.isascii() for b in blocks):
+        return 'utf-8', sure if whole else 0.9
+    if _decodes(blocks, 'utf-8') is not None:
+        return 'utf-8', sure
+    for enc in ('gbk', 'gb18030'):
+        text = _decodes(blocks, enc)
+        if text is not None:
+            return enc, round(sure * max(0.5, _cjk_share(text)), 3)
+    return 'latin-1', 0.2
+
+
+def _read_text(reader, filepath, encoding, **kwargs):
+    """Run ``reader`` once with a pinned or detected encoding.
+
+    A detected encoding is only a guess from a sample; if the parse still
+    hits a bad byte, the fallback encodings listed after it in ``ENCODINGS``
+    are tried in order. The chosen encoding and confidence are stored in
+    ``df.attrs``.
+    """
+    if encoding:
+        candidates, confidence = [encoding], 1.0
+    else:
+        detected, confidence = detect_encoding(filepath)
+        rest = ENCODINGS[ENCODINGS.index(detected) + 1:] if detected in ENCODINGS else ENCODINGS
+        candidates = [detected] + rest
+    for i, enc in enumerate(candidates):
+        try:
+            df = reader(filepath, encoding=enc, **kwargs)
+        except (UnicodeDecodeError, UnicodeError):
+            continue
+        df.attrs['encoding'] = enc
+        df.attrs['encoding_confidence'] = confidence if i == 0 else 0.0
+        return df
+    raise ValueError(f"Cannot decode {filepath} with encodings: {candidates}")
+
+
+# Salary strings such as "6千/月", "0.8-1万/月", "150元/天", "15k-20k", "1.5千以下/月"
+_SALARY_RE = (r'^\s*(?P<lo>\d+(?:\.\d+)?)\s*(?P<lo_unit>[千万元kKwW]?)'
+              r'(?:\s*[-~～至到]\s*(?P<hi>\d+(?:\.\d+)?)\s*(?P<hi_unit>[千万元kKwW]?))?'
+              r'\s*(?:以下|以上|左右)?\s*(?:[/每]\s*(?P<per>小时|时|天|日|周|月|年))?\s*$')
+_SALARY_MAGNITUDE = {'元': 1.0, '千': 1e3, 'k': 1e3, 'K': 1e3, '万': 1e4, 'w': 1e4, 'W': 1e4}
+# Factor to a monthly amount (21.75 paid days a month, 8-hour days)
+_SALARY_PERIOD = {'小时': 174.0, '时': 174.0, '天': 21.75, '日': 21.75,
+                  '周': 52 / 12, '月': 1.0, '年': 1 / 12}
+_SALARY_NAME_HINTS = ('薪', '工资', '月收入', 'salary', 'wage', 'pay')
+
+
+def _salary_parts(s):
+    """Per-row ``(value, scale, is_salary)`` arrays for a string Series.
+
+    ``value`` is the number as written (the midpoint for a range) and
+    ``scale`` the factor to yuan per month, NaN when the string carries no
+    unit. Only the distinct strings go through the regex; rows are mapped
+    back through the factorized codes, so cost is one hashing pass.
+    """
+    codes, uniques = pd.factorize(s)
+    parts = pd.Series(uniques, dtype='string').str.extract(_SALARY_RE)
+    lo = pd.to_numeric(parts['lo']).to_numpy(dtype=float, na_value=np.nan)
+    hi = pd.to_numeric(parts['hi']).to_numpy(dtype=float, na_value=np.nan)
+    value = np.where(np.isnan(hi), lo, (lo + hi) / 2)
+    # "0.8-1万": the lower bound borrows the upper bound's unit
+    unit = parts['hi_unit'].where(parts['hi_unit'].fillna('') != '', parts['lo_unit'])
+    magnitude = unit.map(_SALARY_MAGNITUDE).to_numpy(dtype=float, na_value=np.nan)
+    period = parts['per'].map(_SALARY_PERIOD).to_numpy(dtype=float, na_value=np.nan)
+    scale = np.where(np.isnan(magnitude) & np.isnan(period), np.nan,
+                     np.nan_to_num(magnitude, nan=1.0) * np.nan_to_num(period, nan=1.0))
+    # A trailing sentinel slot makes code -1 (missing) map to NaN / False
+    value, scale = np.append(value, np.nan), np.append(scale, np.nan)
+    matched = np.append(~np.isnan(lo), False)
+    return value[codes], scale[codes], matched[codes]
+
+
+def salary_lookup(values):
+    """``value`` / ``scale`` table for distinct salary strings.
+
+    The same parse as ``parse_salary_columns``, as a lookup table indexed by
+    the strings, for engines that join it against the raw column (e.g. SQL).
+    ``scale`` is NaN when the string states no unit; apply the row's shared
+    unit in that case, as ``parse_salary_columns`` does.
+    """
+    values = pd.Index(values).dropna().unique()
+    value, scale, _ = _salary_parts(pd.Series(values, dtype=object))
+    return pd.DataFrame({'value': value, 'scale': scale}, index=values)
+
+
+def detect_salary_columns(df, min_share=0.5, sample_size=100_000):
+    """Text columns that hold salary strings.
+
+    A column qualifies when at least ``min_share`` of its non-missing values
+    (among the first ``sample_size`` rows) parse as amounts and either some
+    value names a pay period ("/月", "/天", ...) or the column name looks like
+    a salary ("薪", "工资", "salary", ...).
+    """
+    found = []
+    for col in df.columns:
+        s = df[col].iloc[:sample_size]
+        if pd.api.types.is_numeric_dtype(s) or pd.api.types.is_datetime64_any_dtype(s):
+            continue
+        n = s.count()
+        if not n:
+            continue
+        _, _, matched = _salary_parts(s)
+        if matched.sum() < min_share * n:
+            continue
+        named = any(h in str(col).lower() for h in _SALARY_NAME_HINTS)
+        has_period = s[matched].astype(str).str.contains(r'[/每]', regex=True).any()
+        if named or has_period:
+            found.append(col)
+    return found
+
+
+def parse_salary_columns(df, columns=None):
+    """Convert salary string columns to float yuan per month.
+
+    Handles 元/千/万 (and k/w), pay periods /小时 /天 /周 /月 /年, ranges
+    (replaced by their midpoint) and bounds such as "以下". A bare number
+    takes its unit from the first salary column of the same row that has
+    one, so a pair like 最低薪资="0.8", 最高薪资="1万/月" becomes 8000 and
+    10000. Strings that are not amounts (e.g. "面议") become NaN.
+
+    The work is vectorized over the distinct strings of each column, with no
+    per-row Python call, so it scales to tens of millions of rows.
+
+    Args:
+        df: Input DataFrame (not modified).
+        columns: Columns to convert; detected with ``detect_salary_columns``
+            when None.
+
+    Returns:
+        A copy of ``df`` with the converted columns as float64. The converted
+        column names are recorded in ``df.attrs['salary_columns']``.
+    """
+    columns = detect_salary_columns(df) if columns is None else list(columns)
+    out = df.copy(deep=False)
+    out.attrs['salary_columns'] = columns
+    if not columns:
+        return out
+    parts = [_salary_parts(df[c]) for c in columns]
+    # Unit shared across the row: the first column that states one
+    shared = np.full(len(df), np.nan)
+    for _, scale, _ in parts:
+        shared = np.where(np.isnan(shared), scale, shared)
+    shared = np.nan_to_num(shared, nan=1.0)
+    for col, (value, scale, _) in zip(columns, parts):
+        out[col] = value * np.where(np.isnan(scale), shared, scale)
+    return out
+
+
+def iter_salary_parsed(chunks, columns=None):
+    """Apply ``parse_salary_columns`` to a stream of chunks.
+
+    When ``columns`` is None they are detected on the first chunk and reused
+    for the rest, so every chunk gets the same schema.
+    """
+    for chunk in chunks:
+        if columns is None:
+            columns = detect_salary_columns(chunk)
+        yield parse_salary_columns(chunk, columns)
+
+
+def _compact_column(s, category_ratio):
+    """Smallest-footprint lossless variant of ``s`` (or ``s`` itself)."""
+    kind = s.dtype.kind
+    if kind in 'iu':
+        return pd.to_numeric(s, downcast='integer')
+    if kind == 'f':
+        narrow = s.astype('float32')
+        # Only when every value survives the round trip
+        if np.array_equal(narrow.to_numpy(dtype='float64'), s.to_numpy(), equal_nan=True):
+            return narrow
+        return s
+    if not (pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s)):
+        return s
+    n = s.count()
+    if n and s.nunique(dropna=True) <= category_ratio * n:
+        return s.astype('category')
+    if pd.api.types.is_object_dtype(s) and pd.api.types.infer_dtype(s, skipna=True) == 'string':
+        return s.astype('string[pyarrow]')
+    return s
+
+
+def compact_frame(df, category_ratio=0.5):
+    """Shrink a DataFrame's memory footprint without changing its values.
+
+    Integers are downcast to the narrowest signed width that holds them,
+    floats to float32 when every value round-trips exactly, text columns
+    with at most ``category_ratio`` distinct values per row become
+    ``category``, and remaining object text columns become Arrow-backed
+    strings. A conversion is only kept when it actually saves memory.
+
+    Args:
+        df: Input DataFrame (not modified).
+        category_ratio: Maximum distinct/non-null ratio for ``category``.
+
+    Returns:
+        Tuple ``(compacted, report)``. ``report`` has one row per column
+        with the dtypes and deep memory usage before/after, plus
+        ``bytes_saved``.
+    """
+    out = df.copy(deep=False)
+    rows = []
+    for col in df.columns:
+        s = df[col]
+        before = s.memory_usage(deep=True, index=False)
+        new = _compact_column(s, category_ratio)
+        after = new.memory_usage(deep=True, index=False) if new is not s else before
+        if after < before:
+            out[col] = new
+        else:
+            new, after = s, before
+        rows.append((col, str(s.dtype), str(new.dtype), before, after, before - after))
+    report = pd.DataFrame(rows, columns=['column', 'dtype_before', 'dtype_after',
+                                         'bytes_before', 'bytes_after', 'bytes_saved'])
+    return out, report.set_index('column')
+
+
+_FILTER_OPS = {
+    '==': operator.eq, '=': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    'in': lambda s, v: s.isin(v), 'not in': lambda s, v: ~s.isin(v),
+}
+
+
+def _filter_groups(filters):
+    """``filters`` in disjunctive normal form: a list of AND-ed tuple lists."""
+    if not filters:
+        return []
+    if isinstance(filters[0][0], (list, tuple)):
+        return [list(group) for group in filters]
+    return [list(filters)]
+
+
+def _needed_columns(columns, filters):
+    """``columns`` plus any column a filter refers to (None means all)."""
+    if columns is None:
+        return None
+    extra = [col for group in _filter_groups(filters) for col, _, _ in group]
+    return list(dict.fromkeys([*columns, *extra]))
+
+
+def _filter_mask(df, filters):
+    mask = pd.Series(False, index=df.index)
+    for group in _filter_groups(filters):
+        part = pd.Series(True, index=df.index)
+        for col, op, value in group:
+            if op not in _FILTER_OPS:
+                raise ValueError(f"Unsupported filter operator: {op!r}")
+            part &= _FILTER_OPS[op](df[col], value).fillna(False).astype(bool)
+        mask |= part
+    return mask
+
+
+def select(df, columns=None, filters=None):
+    """Keep the rows matching ``filters`` and the ``columns`` listed, in order.
+
+    ``filters`` uses the pyarrow / ``pd.read_parquet`` syntax: a list of
+    ``(column, op, value)`` tuples that must all hold, or a list of such
+    lists any of which may hold. Supported ops: ``== = != < <= > >= in``
+    and ``not in``.
+    """
+    if filters:
+        attrs = df.attrs
+        df = df[_filter_mask(df, filters).to_numpy()]
+        df.attrs = attrs
+    if columns is not None:
+        df = df[list(columns)]
+    return df
+
+
+CSV_ENGINES = ('c', 'pyarrow')
+
+
+@contextlib.contextmanager
+def _csv_source(filepath, engine, memory_map):
+    """``(source, memory_map)`` to hand ``pd.read_csv``: a decompressing
+    stream, a pyarrow memory map, or the path itself."""
+    if split_ext(filepath)[1]:
+        with open_input(filepath) as f:
+            yield f, False
+    elif memory_map and engine == 'pyarrow':
+        import pyarrow as pa
+        with pa.memory_map(filepath) as f:
+            yield f, False
+    else:
+        yield filepath, memory_map
+
+
+def _check_decoded(df, encoding):
+    """Raise ``UnicodeDecodeError`` for columns pyarrow could not decode.
+
+    The encoding is sniffed from a sample; when a later row is not valid
+    UTF-8, pyarrow does not fail but types the whole column as binary
+    (``bytes`` values), so the next candidate encoding must be tried.
+    """
+    for col in df.columns[df.dtypes == object]:
+        s = df[col]
+        first = s.first_valid_index()
+        if first is not None and isinstance(s[first], bytes):
+            raise UnicodeDecodeError(encoding, s[first], 0, len(s[first]),
+                                     f"column {col!r} is not valid {encoding}")
+
+
+def _read_csv(filepath, encoding, columns=None, filters=None, chunksize=200_000, engine='c',
+              memory_map=False):
+    """``pd.read_csv`` that parses only the needed columns.
+
+    With the C engine and ``filters`` the file is read in chunks and each
+    chunk is filtered before the next is parsed, so rows that fail the
+    predicate are never held in memory together. The pyarrow engine parses
+    blocks on all cores; it has no chunked mode, so filters are applied
+    after the (projected) read. Non-UTF-8 input is transcoded to UTF-8 by
+    pyarrow as a streaming step in front of the parser. With ``memory_map``
+    either engine reads the file through an mmap instead of buffered reads.
+    """
+    usecols = _needed_columns(columns, filters)
+    if engine == 'pyarrow':
+        try:
+            with _csv_source(filepath, engine, memory_map) as (source, _):
+                df = pd.read_csv(source, encoding=encoding, usecols=usecols, engine='pyarrow')
+            _check_decoded(df, encoding)
+            df.attrs['engine'] = 'pyarrow'
+            return select(df, columns, filters)
+        except UnicodeError:
+            raise
+        except (ValueError, NotImplementedError) as e:
+            # Input or options pyarrow cannot handle (e.g. ragged rows, which
+            # surface as ParserError / ArrowInvalid): use the C parser
+            print(f"[WARN] pyarrow CSV engine failed on {filepath} ({type(e).__name__}: {e}); "
+                  f"falling back to the C parser")
+    elif engine != 'c':
+        raise ValueError(f"Unknown CSV engine: {engine!r} (expected one of {CSV_ENGINES})")
+    with _csv_source(filepath, 'c', memory_map) as (source, mmap):
+        if not filters:
+            df = select(pd.read_csv(source, encoding=encoding, usecols=usecols,
+                                    memory_map=mmap), columns)
+        else:
+            with pd.read_csv(source, encoding=encoding, usecols=usecols, chunksize=chunksize,
+                             memory_map=mmap) as reader:
+                df = pd.concat([select(chunk, columns, filters) for chunk in reader],
+                               ignore_index=True)
+    df.attrs['engine'] = 'c'
+    return df
+
+
+def _excel_engine():
+    """``'calamine'`` (Rust reader, several times faster) if usable, else pandas' default.
+
+    Needs python-calamine and pandas 2.2+, the first release with that engine.
+    """
+    usable = (importlib.util.find_spec('python_calamine')
+              and importlib.util.find_spec('pandas.io.excel._calamine'))
+    return 'calamine' if usable else None
+
+
+def _read_excel(filepath, sheet_name=0, columns=None, filters=None):
+    """``pd.read_excel`` via the fastest available engine, narrowed by ``select``.
+
+    Returns a dict of DataFrames when ``sheet_name`` is None or a list.
+    """
+    usecols = _needed_columns(columns, filters)
+    sheets = pd.read_excel(filepath, sheet_name=sheet_name, usecols=usecols,
+                           engine=_excel_engine())
+    if isinstance(sheets, dict):
+        return {name: select(df, columns, filters) for name, df in sheets.items()}
+    return select(sheets, columns, filters)
+
+
+def excel_sheet_names(filepath):
+    """Worksheet names of an Excel file, in workbook order."""
+    with pd.ExcelFile(filepath, engine=_excel_engine()) as xl:
+        return list(xl.sheet_names)
+
+
+def resolve_sheet(filepath, sheet):
+    """Sheet name or position for a worksheet given as text (e.g. on the command line).
+
+    A worksheet named ``sheet`` wins, so ``"2024"`` selects the sheet called
+    2024; otherwise an all-digit ``sheet`` is a position (0 = first).
+
+    Raises:
+        ValueError: If ``sheet`` is neither a sheet name nor a valid position.
+    """
+    names = excel_sheet_names(filepath)
+    if sheet in names:
+        return sheet
+    if sheet.isdigit() and int(sheet) < len(names):
+        return int(sheet)
+    raise ValueError(f"No worksheet {sheet!r} in {filepath} (sheets: {names})")
+
+
+def _excel_rows(filepath, sheet_name=0):
+    """Stream a worksheet's rows as value tuples with openpyxl in read-only mode.
 
-def load_data(filepath):
+    Read-only mode parses the sheet XML incrementally, so memory does not
+    grow with the number of rows.
+    """
+    from openpyxl import load_workbook
+    wb = load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
+    try:
+        try:
+            ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        except (IndexError, KeyError):
+            raise ValueError(f"No worksheet {sheet_name!r} in {filepath} "
+                             f"(sheets: {wb.sheetnames})") from None
+        yield from ws.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def iter_excel(filepath, sheet_name=0, chunksize=200_000):
+    """Iterate over one worksheet of an .xlsx file as DataFrame chunks.
+
+    The first row is the header; fully empty rows are skipped. Each chunk's
+    dtypes are inferred from its own cell values.
+
+    Args:
+        filepath: Path to the workbook.
+        sheet_name: Sheet position (int) or name.
+        chunksize: Maximum rows per chunk.
+
+    Yields:
+        pandas DataFrame chunks.
+    """
+    rows = _excel_rows(filepath, sheet_name)
+    header = next(rows, None)
+    if header is None:
+        return
+    # Read-only sheets may report trailing blank columns
+    width = max((i + 1 for i, v in enumerate(header) if v is not None), default=0)
+    names = [f'Unnamed: {i}' if v is None else str(v) for i, v in enumerate(header[:width])]
+    batch = []
+    for row in rows:
+        row = row[:width]
+        if all(v is None for v in row):
+            continue
+        batch.append(row)
+        if len(batch) == chunksize:
+            yield pd.DataFrame(batch, columns=names).infer_objects()
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch, columns=names).infer_objects()
+
+
+def _is_nested(v):
+    return isinstance(v, (dict, list))
+
+
+def flatten_records(records, max_depth=None, sep='.'):
+    """Flatten a list of (nested) JSON records into a DataFrame.
+
+    Nested objects become path-named columns (``{"a": {"b": 1}}`` gives
+    ``a.b``) down to ``max_depth`` levels (None means all). Anything still
+    nested below that, and lists, are kept as compact JSON strings so every
+    cell stays hashable and countable.
+    """
+    df = pd.json_normalize(records, sep=sep, max_level=max_depth)
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_object_dtype(s):
+            nested = s.map(_is_nested)
+            if nested.any():
+                df[col] = s.where(~nested, s[nested].map(
+                    lambda v: json.dumps(v, ensure_ascii=False, separators=(',', ':'))))
+    return df
+
+
+def iter_json_lines(filepath, chunksize=200_000, encoding=None, max_depth=None, sep='.'):
+    """Iterate over a JSON Lines file (.jsonl / .ndjson) as flattened DataFrame chunks.
+
+    Only ``chunksize`` parsed records are held at a time; each batch is
+    flattened with ``flatten_records``. Blank lines are skipped. Chunks may
+    differ in columns when later records introduce new keys.
+
+    Args:
+        filepath: Path to the file, one JSON object per line.
+        chunksize: Maximum records per chunk.
+        encoding: Pin the text encoding instead of detecting it.
+        max_depth: Nesting levels to expand into columns (None means all).
+        sep: Separator joining the key path into a column name.
+
+    Yields:
+        pandas DataFrame chunks.
+    """
+    enc = encoding or detect_encoding(filepath)[0]
+    batch = []
+    with open_input(filepath) as raw, io.TextIOWrapper(raw, encoding=enc) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            batch.append(json.loads(line))
+            if len(batch) == chunksize:
+                yield flatten_records(batch, max_depth, sep)
+                batch = []
+    if batch:
+        yield flatten_records(batch, max_depth, sep)
+
+
+def _read_json(filepath, encoding):
+    with open_input(filepath) as raw, io.TextIOWrapper(raw, encoding=encoding) as f:
+        return pd.read_json(f)
+
+
+def _read_json_lines(filepath, encoding, max_depth=None, sep='.'):
+    chunks = list(iter_json_lines(filepath, encoding=encoding, max_depth=max_depth, sep=sep))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+
+def load_data(filepath, encoding=None, parse_salary=False, compact=False, columns=None,
+              filters=None, engine='c', memory_map=True, sheet_name=0, max_depth=None):
     """Load a data file into a DataFrame with automatic format and encoding detection.
 
-    Supports: CSV, Excel (.xlsx/.xls), JSON, Parquet.
+    Supports: CSV, Excel (.xlsx/.xlsm/.xls), JSON, JSON Lines (.jsonl/.ndjson),
+    Parquet. Nested JSON records are flattened into path-named columns
+    (``user.address.city``). A directory, glob pattern or list of paths is
+    loaded as one dataset with ``load_dataset``.
+
+    ``columns`` and ``filters`` are pushed down into the reader where it can
+    use them: Parquet skips unread columns and, via row-group statistics,
+    whole row groups; CSV parses only the needed columns and filters chunk
+    by chunk. Other formats are loaded first and then narrowed.
+
+    For text formats the encoding is sniffed once from a byte sample (see
+    ``detect_encoding``); the result is recorded in ``df.attrs['encoding']``
+    and ``df.attrs['encoding_confidence']``.
 
     Args:
         filepath: Path to the data file.
+        encoding: Pin the text encoding instead of detecting it.
+        parse_salary: Convert salary string columns ("6千/月", "1.5万/年",
+            ...) to float yuan per month with ``parse_salary_columns``.
+        compact: Shrink dtypes with ``compact_frame``; bytes saved per
+            column are recorded in ``df.attrs['bytes_saved']``.
+        columns: Read only these columns (in this order).
+        filters: Keep only matching rows; see ``select`` for the syntax.
+        engine: CSV parser, ``'c'`` (pandas default, single-threaded) or
+            ``'pyarrow'`` (multi-threaded). The engine actually used is
+            recorded in ``df.attrs['engine']``.
+        memory_map: Read local CSV and Parquet files through an mmap, so
+            pages come straight from the OS page cache: encoding retries and
+            parallel readers of the same file share them instead of copying.
+        sheet_name: Excel sheet position or name; None (all sheets) or a
+            list returns a dict of DataFrames keyed by sheet name. Excel is
+            read with calamine when ``python-calamine`` is installed.
+        max_depth: JSON nesting levels expanded into columns (None means
+            all); deeper values are kept as JSON strings.
 
     Returns:
-        pandas DataFrame.
+        pandas DataFrame, or a dict of them for several Excel sheets.
 
     Raises:
         ValueError: If file format is not supported.
     """
-    ext = filepath.rsplit('.', 1)[-1].lower()
+    if is_dataset(filepath):
+        return load_dataset(filepath, encoding=encoding, parse_salary=parse_salary,
+                            compact=compact, columns=columns, filters=filters, engine=engine,
+                            memory_map=memory_map, sheet_name=sheet_name, max_depth=max_depth)
+    df = _load(filepath, encoding, columns, filters, engine,
+               memory_map and os.path.isfile(filepath), sheet_name, max_depth)
+    if isinstance(df, dict):
+        return {name: _finish(d, parse_salary, compact) for name, d in df.items()}
+    return _finish(df, parse_salary, compact)
+
+
+def _finish(df, parse_salary, compact):
+    if parse_salary:
+        df = parse_salary_columns(df)
+    if compact:
+        df, report = compact_frame(df)
+        df.attrs['bytes_saved'] = {str(c): int(v) for c, v in report['bytes_saved'].items()}
+    return df
+
+
+# Formats that can be parsed from a forward-only decompressing stream
+_STREAMABLE = ('csv', 'json', 'jsonl', 'ndjson')
+
+
+def _load(filepath, encoding, columns=None, filters=None, engine='c', memory_map=False,
+          sheet_name=0, max_depth=None):
+    ext, codec = split_ext(filepath)
+    if codec and ext not in _STREAMABLE:
+        raise ValueError(f"Compressed .{ext} input is not supported; decompress it first")
 
     if ext == 'csv':
-        encodings = ['utf-8-sig', 'utf-8', 'gbk', 'gb2312', 'gb18030', 'latin-1']
-        for enc in encodings:
-            try:
-                return pd.read_csv(filepath, encoding=enc)
-            except (UnicodeDecodeError, UnicodeError):
-                continue
-        raise ValueError(f"Cannot decode CSV file with encodings: {encodings}")
+        return _read_text(_read_csv, filepath, encoding, columns=columns, filters=filters,
+                          engine=engine, memory_map=memory_map)
 
-    elif ext in ('xlsx', 'xls'):
-        return pd.read_excel(filepath)
+    elif ext in ('xlsx', 'xlsm', 'xls'):
+        return _read_excel(filepath, sheet_name, columns, filters)
 
     elif ext == 'json':
-        encodings = ['utf-8', 'gbk']
-        for enc in encodings:
-            try:
-                return pd.read_json(filepath, encoding=enc)
-            except (UnicodeDecodeError, ValueError):
-                continue
-        raise ValueError("Cannot decode JSON file.")
+        try:
+            df = _read_text(_read_json, filepath, encoding)
+        except ValueError as e:
+            raise ValueError("Cannot decode JSON file.") from e
+        if any(df[c].map(_is_nested).any() for c in df.columns
+               if pd.api.types.is_object_dtype(df[c])):
+            attrs = df.attrs
+            df = flatten_records(df.to_dict('records'), max_depth)
+            df.attrs = attrs
+        return select(df, columns, filters)
+
+    elif ext in ('jsonl', 'ndjson'):
+        try:
+            df = _read_text(_read_json_lines, filepath, encoding, max_depth=max_depth)
+        except ValueError as e:
+            raise ValueError("Cannot decode JSON Lines file.") from e
+        return select(df, columns, filters)
 
     elif ext == 'parquet':
-        return pd.read_parquet(filepath)
+        return pd.read_parquet(filepath, columns=columns, filters=filters or None,
+                               memory_map=memory_map)
 
     else:
         raise ValueError(f"Unsupported file format: .{ext}")
 
 
+def iter_chunks(filepath, chunksize=200_000, encoding=None, parse_salary=False, columns=None,
+                filters=None, memory_map=True, sheet_name=0, max_depth=None):
+    """Iterate over a data file as DataFrames of at most ``chunksize`` rows.
+
+    CSV, Parquet, JSON Lines and .xlsx/.xlsm are read incrementally, so memory
+    is bounded by the chunk size. Legacy .xls and JSON documents have no
+    incremental reader and are loaded whole, then sliced. JSON Lines chunks
+    are aligned to the columns of the first chunk. A directory, glob or list
+    of paths is read file by file (see ``iter_dataset_chunks``).
+
+    Args:
+        filepath: Path to the data file.
+        chunksize: Maximum rows per chunk.
+        encoding: Pin the text encoding instead of detecting it.
+        parse_salary: Convert salary string columns (detected on the first
+            chunk) to float yuan per month.
+        columns: Read only these columns (pushed down like in ``load_data``).
+        filters: Keep only matching rows; see ``select`` for the syntax.
+        memory_map: Read local CSV and Parquet files through an mmap.
+        sheet_name: Excel sheet position or name.
+        max_depth: JSON nesting levels expanded into columns.
+
+    Yields:
+        pandas DataFrame chunks.
+    """
+    if is_dataset(filepath):
+        chunks = iter_dataset_chunks(filepath, chunksize, encoding=encoding, columns=columns,
+                                     filters=filters, memory_map=memory_map,
+                                     sheet_name=sheet_name, max_depth=max_depth)
+    else:
+        chunks = _iter_chunks(filepath, chunksize, encoding, columns, filters,
+                              memory_map and os.path.isfile(filepath), sheet_name, max_depth)
+    return iter_salary_parsed(chunks) if parse_salary else chunks
+
+
+def _iter_chunks(filepath, chunksize, encoding, columns=None, filters=None, memory_map=False,
+                 sheet_name=0, max_depth=None):
+    ext, codec = split_ext(filepath)
+    if codec and ext not in _STREAMABLE:
+        raise ValueError(f"Compressed .{ext} input is not supported; decompress it first")
+
+    if ext == 'csv':
+        # Chunks already yielded cannot be re-read, so there is no fallback
+        # here: pin ``encoding`` if detection gets a file wrong.
+        enc = encoding or detect_encoding(filepath)[0]
+        with _csv_source(filepath, 'c', memory_map) as (source, mmap), \
+                pd.read_csv(source, encoding=enc, chunksize=chunksize,
+                            usecols=_needed_columns(columns, filters),
+                            memory_map=mmap) as reader:
+            for chunk in reader:
+                chunk = select(chunk, columns, filters)
+                if len(chunk) or not filters:
+                    yield chunk
+
+    elif ext == 'parquet':
+        import pyarrow.dataset as ds
+        import pyarrow.fs as pafs
+        import pyarrow.parquet as pq
+        expr = pq.filters_to_expression(filters) if filters else None
+        filesystem = pafs.LocalFileSystem(use_mmap=True) if memory_map else None
+        for batch in ds.dataset(filepath, format='parquet', filesystem=filesystem).to_batches(
+                columns=columns, filter=expr, batch_size=chunksize):
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+    elif ext in ('jsonl', 'ndjson'):
+        schema = None
+        for chunk in iter_json_lines(filepath, chunksize, encoding, max_depth):
+            # Keys first seen in later records are dropped; missing ones are NaN
+            schema = list(chunk.columns) if schema is None else schema
+            chunk = select(chunk.reindex(columns=schema), columns, filters)
+            if len(chunk) or not filters:
+                yield chunk
+
+    elif ext in ('xlsx', 'xlsm'):
+        for chunk in iter_excel(filepath, sheet_name, chunksize):
+            chunk = select(chunk, columns, filters)
+            if len(chunk) or not filters:
+                yield chunk
+
+    else:
+        df = load_data(filepath, encoding=encoding, columns=columns, filters=filters,
+                       memory_map=memory_map, sheet_name=sheet_name, max_depth=max_depth)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+
+
+_DATA_EXTS = ('csv', 'xlsx', 'xlsm', 'xls', 'json', 'jsonl', 'ndjson', 'parquet')
+
+
+def is_dataset(path):
+    """True for a directory, a glob pattern or a list of paths."""
+    if isinstance(path, (list, tuple)):
+        return True
+    return os.path.isdir(path) or (not os.path.exists(path) and glob.has_magic(path))
+
+
+def expand_paths(path):
+    """Sorted data files named by a path, directory (recursive), glob or list.
+
+    Hidden files and markers such as ``_SUCCESS`` are skipped, as are files
+    whose format ``load_data`` cannot read.
+    """
+    if isinstance(path, (list, tuple)):
+        return [f for p in path for f in expand_paths(p)]
+    if os.path.isdir(path):
+        found = glob.glob(os.path.join(glob.escape(path), '**', '*'), recursive=True)
+    elif glob.has_magic(path) and not os.path.exists(path):
+        found = glob.glob(path, recursive=True)
+    else:
+        return [path]
+    files = []
+    for f in sorted(found):
+        name = os.path.basename(f)
+        if os.path.isfile(f) and not name.startswith(('.', '_')) and \
+                split_ext(f)[0] in _DATA_EXTS:
+            files.append(f)
+    if not files:
+        raise ValueError(f"No data files match {path}")
+    return files
+
+
+def _dataset_root(path):
+    """Directory that partition paths are relative to."""
+    if isinstance(path, (list, tuple)) or not os.path.isdir(path):
+        pattern = path if isinstance(path, str) else os.path.commonpath(path)
+        # Stop at the first path component with a wildcard
+        parts = pattern.replace('\\', '/').split('/')
+        for i, part in enumerate(parts):
+            if glob.has_magic(part):
+                return '/'.join(parts[:i]) or '.'
+        return os.path.dirname(pattern) or '.'
+    return path
+
+
+def hive_partitions(filepath, root='.'):
+    """``{key: value}`` from Hive-style ``key=value`` directories under ``root``."""
+    rel = os.path.relpath(os.path.dirname(os.path.abspath(filepath)), os.path.abspath(root))
+    parts = {}
+    for segment in rel.replace(os.sep, '/').split('/'):
+        key, eq, value = segment.partition('=')
+        if eq and key:
+            parts[key] = value
+    return parts
+
+
+def _partition_table(files, root):
+    """One row per file with its (typed) partition keys."""
+    table = pd.DataFrame([hive_partitions(f, root) for f in files], index=range(len(files)))
+    for key in table.columns:
+        num = pd.to_numeric(table[key], errors='coerce')
+        if num.notna().all():
+            table[key] = num
+    return table
+
+
+def schema_drift(files, frames):
+    """Columns whose presence or dtype differs across files.
+
+    Returns:
+        ``{column: {'missing_from': [files...], 'dtypes': {dtype: n_files}}}``
+        for every column that is not the same in all files.
+    """
+    present, dtypes = {}, {}
+    for f, df in zip(files, frames):
+        for col, dtype in df.dtypes.items():
+            present.setdefault(col, set()).add(f)
+            dtypes.setdefault(col, {}).setdefault(str(dtype), 0)
+            dtypes[col][str(dtype)] += 1
+    drift = {}
+    for col in present:
+        missing = [f for f in files if f not in present[col]]
+        if missing or len(dtypes[col]) > 1:
+            drift[str(col)] = {'missing_from': missing, 'dtypes': dtypes[col]}
+    return drift
+
+
+def _unify(frames):
+    """Make per-file frames concatenable without object columns mixing
+    numbers and text: a column that is text in some files and numeric in
+    others becomes text everywhere. Numeric width differences are left to
+    ``pd.concat`` (e.g. int + float -> float)."""
+    kinds = {}
+    for df in frames:
+        for col, dtype in df.dtypes.items():
+            kinds.setdefault(col, set()).add(pd.api.types.is_numeric_dtype(dtype))
+    mixed = [col for col, k in kinds.items() if len(k) > 1]
+    out = []
+    for df in frames:
+        cols = [c for c in mixed if c in df.columns]
+        if cols:
+            df = df.copy(deep=False)
+            for c in cols:
+                s = df[c]
+                df[c] = s.astype(str).where(s.notna())
+        out.append(df)
+    return out
+
+
+def _split_filters(filters, keys):
+    """``(partition filters, file filters)`` for a flat AND filter list.
+
+    DNF filters (lists of lists) are not split and stay file filters.
+    """
+    groups = _filter_groups(filters)
+    if len(groups) != 1:
+        return [], filters
+    on_keys = [f for f in groups[0] if f[0] in keys]
+    rest = [f for f in groups[0] if f[0] not in keys]
+    return on_keys, rest
+
+
+def _plan_dataset(path, partition_columns, columns, filters):
+    """Files to read (after partition pruning) and what to ask each for.
+
+    Returns ``(files, parts, keys, file_columns, file_filters)``.
+    """
+    files = expand_paths(path)
+    parts = _partition_table(files, _dataset_root(path))
+    keys = list(parts.columns) if partition_columns else []
+    part_filters, file_filters = _split_filters(filters, keys)
+    if part_filters:
+        keep = _filter_mask(parts, part_filters).to_numpy()
+        files, parts = [f for f, k in zip(files, keep) if k], parts[keep]
+    file_columns = None if columns is None else [c for c in columns if c not in keys]
+    return files, parts, keys, file_columns, file_filters
+
+
+def load_dataset(path, workers=None, partition_columns=True, parse_salary=False, compact=False,
+                 columns=None, filters=None, **read_kwargs):
+    """Load many files (directory, glob or list) as one DataFrame.
+
+    Files are read in parallel on a thread pool (the CSV and Parquet readers
+    release the GIL while parsing). Schemas are unified: columns missing
+    from a file are NaN there, and a column that is numeric in some files
+    and text in others becomes text. What differed is recorded in
+    ``df.attrs['schema_drift']`` (see ``schema_drift``).
+
+    Hive-style directories (``dt=2026-01-01/part-0.parquet``) become
+    columns when ``partition_columns`` is set; filters on partition keys
+    skip whole files before they are opened.
+
+    Args:
+        path: Directory (searched recursively), glob pattern or list of paths.
+        workers: Reader threads (default: ``min(32, cpu count + 4)``).
+        partition_columns: Add Hive partition keys as columns.
+        parse_salary, compact, columns, filters: As in ``load_data``;
+            salary parsing and compaction run once on the combined frame.
+        **read_kwargs: Passed to ``load_data`` for every file.
+
+    Returns:
+        pandas DataFrame with ``attrs['files']`` and ``attrs['schema_drift']``.
+    """
+    files, parts, keys, file_columns, file_filters = _plan_dataset(
+        path, partition_columns, columns, filters)
+
+    def read(f):
+        return load_data(f, columns=file_columns, filters=file_filters, **read_kwargs)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(read, files))
+    drift = schema_drift(files, frames)
+    frames = _unify(frames)
+    if keys:
+        frames = [df.assign(**{k: parts.at[i, k] for k in keys})
+                  for i, df in zip(parts.index, frames)]
+    encodings = {df.attrs.get('encoding') for df in frames}
+    df = pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
+    df = select(df, columns)
+    df.attrs = {'files': len(files), 'schema_drift': drift}
+    if len(encodings) == 1 and None not in encodings:
+        df.attrs['encoding'] = encodings.pop()
+        df.attrs['encoding_confidence'] = min(f.attrs['encoding_confidence'] for f in frames)
+    return _finish(df, parse_salary, compact)
+
+
+def iter_dataset_chunks(path, chunksize=200_000, partition_columns=True, columns=None,
+                        filters=None, **chunk_kwargs):
+    """Iterate over every file of a dataset, one file after another.
+
+    Chunks are aligned to the columns of the first file (plus partition
+    keys): later columns are dropped, missing ones are NaN. Filters on
+    partition keys skip whole files, as in ``load_dataset``.
+    """
+    files, parts, keys, file_columns, file_filters = _plan_dataset(
+        path, partition_columns, columns, filters)
+    schema = None
+    for f, i in zip(files, parts.index):
+        for chunk in _iter_chunks(f, chunksize, columns=file_columns, filters=file_filters,
+                                  **chunk_kwargs):
+            schema = list(chunk.columns) if schema is None else schema
+            chunk = chunk.reindex(columns=schema)
+            if keys:
+                chunk = chunk.assign(**{k: parts.at[i, k] for k in keys})
+            yield select(chunk, columns)
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of bytes ``[start, end)`` of a file."""
+
+    def __init__(self, filepath, start, end):
+        self._f = open(filepath, 'rb')
+        self._f.seek(start)
+        self._left = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = self._f.readinto(memoryview(b)[:max(0, min(len(b), self._left))])
+        self._left -= n
+        return n
+
+    def close(self):
+        self._f.close()
+        super().close()
+
+
+def csv_row_boundary(filepath):
+    """Byte offset just past the last newline, i.e. the end of the last complete row."""
+    size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as f:
+        pos = size
+        while pos > 0:
+            step = min(pos, 1 << 16)
+            f.seek(pos - step)
+            block = f.read(step)
+            i = block.rfind(b'\n')
+            if i >= 0:
+                return pos - step + i + 1
+            pos -= step
+    return 0
+
+
+def iter_csv_range(filepath, start, end, encoding, chunksize=200_000, names=None,
+                   **read_kwargs):
+    """Iterate over the CSV rows stored in bytes ``[start, end)`` of a file.
+
+    With ``names`` the range is read as headerless rows (e.g. rows appended
+    after a previously processed offset); otherwise the range starts with
+    the header line. Extra keyword arguments go to ``pd.read_csv``.
+
+    Yields:
+        pandas DataFrame chunks.
+    """
+    if start > 0 and encoding == 'utf-8-sig':
+        encoding = 'utf-8'
+    raw = io.BufferedReader(_ByteRange(filepath, start, end))
+    with io.TextIOWrapper(raw, encoding=encoding, newline='') as text:
+        if names is not None:
+            read_kwargs.update(header=None, names=names)
+        with pd.read_csv(text, chunksize=chunksize, **read_kwargs) as reader:
+            yield from reader
+
+
 def inspect_data(df):
     """Print a concise summary of the DataFrame."""
     print(f"Shape: {df.shape[0]} rows x {df.shape[1]} columns")
+    if 'encoding' in df.attrs:
+        print(f"Encoding: {df.attrs['encoding']} "
+              f"(confidence {df.attrs['encoding_confidence']:.0%})")
+    if 'files' in df.attrs:
+        print(f"Files: {df.attrs['files']}")
+        for col, d in df.attrs['schema_drift'].items():
+            print(f"  schema drift in {col!r}: missing from {len(d['missing_from'])} file(s), "
+                  f"dtypes {d['dtypes']}")
     print(f"\nColumn types:\n{df.dtypes}")
     print(f"\nFirst 5 rows:\n{df.head()}")
     print(f"\nMissing values:\n{df.isnull().sum()}")
@@ -0,0 +1,101 @@
+"""Chart output profiles: resolution, file format and encoder settings.
+
+``draft`` is for fast interactive iterations (small, quickly encoded PNGs),
+``screen`` for reports read on a monitor, ``web`` for browser-only reports
+(SVG, nothing rasterized) and ``print`` (the default) for print-quality
+300 dpi figures.
+"""
+
+import os
+from dataclasses import dataclass, replace
+
+import matplotlib
+
+FORMATS = ("png", "webp", "svg")
+
+
+@dataclass(frozen=True)
+class OutputProfile:
+    """How charts are written to disk.
+
+    Attributes:
+        name: Profile name.
+        dpi: Raster resolution (ignored by SVG text and vector paths).
+        format: ``"png"``, ``"webp"`` or ``"svg"``.
+        compress_level: PNG zlib level, 0 (fastest) to 9 (smallest).
+        tight: Crop to the drawn artists with ``bbox_inches="tight"``, which
+            costs one extra layout pass per save.
+        svg_fonttype: ``"path"`` embeds the glyphs actually used as paths
+            (self-contained, renders identically anywhere); ``"none"`` keeps
+            text as ``<text>`` referencing the font by name (smaller, and
+            searchable, but the viewer needs the font).
+    """
+
+    name: str
+    dpi: int
+    format: str = "png"
+    compress_level: int = 6
+    tight: bool = True
+    svg_fonttype: str = "path"
+
+    @property
+    def ext(self):
+        return "." + self.format
+
+    @property
+    def raster(self):
+        """True for a PNG, which Word/PDF export can embed as is."""
+        return self.format == "png"
+
+    def path(self, filepath):
+        """``filepath`` with its extension replaced by this profile's format."""
+        return os.path.splitext(filepath)[0] + self.ext
+
+    def savefig_kwargs(self):
+        kwargs = {"dpi": self.dpi, "format": self.format}
+        if self.tight:
+            kwargs["bbox_inches"] = "tight"
+        if self.format == "png":
+            kwargs["pil_kwargs"] = {"compress_level": self.compress_level}
+        elif self.format == "webp":
+            # Lossless: lossy WebP smears the thin lines and text of a chart
+            kwargs["pil_kwargs"] = {"lossless": True, "method": 2}
+        return kwargs
+
+    def save(self, fig, filepath):
+        """Save ``fig`` (a Figure) to ``filepath`` with this profile's settings."""
+        with matplotlib.rc_context({"svg.fonttype": self.svg_fonttype}):
+            fig.savefig(filepath, **self.savefig_kwargs())
+
+
+PROFILES = {
+    "draft": OutputProfile("draft", dpi=72, compress_level=1, tight=False),
+    "screen": OutputProfile("screen", dpi=120),
+    "web": OutputProfile("web", dpi=96, format="svg"),
+    "print": OutputProfile("print", dpi=300),
+}
+
+
+def get_profile(profile=None, fmt=None):
+    """Resolve a profile name (or ``OutputProfile``), optionally overriding its format.
+
+    Args:
+        profile: A name in ``PROFILES`` or an ``OutputProfile``;
+            None means ``"print"``.
+        fmt: One of ``FORMATS`` to use instead of the profile's format.
+
+    Returns:
+        The resolved ``OutputProfile``.
+    """
+    if profile is None:
+        profile = "print"
+    if not isinstance(profile, OutputProfile):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown output profile: {profile!r} (expected one of "
+                             f"{tuple(PROFILES)})")
+        profile = PROFILES[profile]
+    if fmt is not None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown chart format: {fmt!r} (expected one of {FORMATS})")
+        profile = replace(profile, format=fmt)
+    return profile
@@ -0,0 +1,80 @@
+"""Reduce large point sets to pixel resolution before plotting.
+
+Matplotlib's cost grows with the number of points it is handed, while a
+chart can only show one value range per pixel column. These helpers bin the
+points with NumPy first (one O(n) pass, no sort), so drawing cost depends on
+the image size, not on the row count.
+"""
+
+import numpy as np
+
+
+def _coords(x):
+    """``(float values, valid mask, is_time)`` for numeric or datetime64 ``x``."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype("datetime64[ns]")
+        return x.view("int64").astype(float), ~np.isnat(x), True
+    x = x.astype(float)
+    return x, ~np.isnan(x), False
+
+
+def _bin(v, lo, hi, n):
+    """Bin index in ``[0, n)`` of each value of ``v`` over ``[lo, hi]``."""
+    if hi == lo:
+        return np.zeros(len(v), dtype=np.int64)
+    return np.minimum(((v - lo) * (n / (hi - lo))).astype(np.int64), n - 1)
+
+
+def line_pixels(x, y, width):
+    """Per pixel column of ``x``: its center and the min / max / mean of ``y``.
+
+    Args:
+        x: Numeric or datetime64 positions, in any order.
+        y: Values; NaN (and NaT in ``x``) rows are dropped.
+        width: Number of pixel columns across the x range.
+
+    Returns:
+        Tuple ``(x, ymin, ymax, ymean)`` of arrays, one entry per non-empty
+        column in ascending ``x``; ``x`` keeps datetime64 when given it.
+    """
+    xf, ok, is_time = _coords(x)
+    y = np.asarray(y, dtype=float)
+    ok &= ~np.isnan(y)
+    xf, y = xf[ok], y[ok]
+    if not len(xf):
+        empty = np.array([], dtype="datetime64[ns]" if is_time else float)
+        return empty, np.array([]), np.array([]), np.array([])
+    lo, hi = xf.min(), xf.max()
+    col = _bin(xf, lo, hi, width)
+    count = np.bincount(col, minlength=width)
+    total = np.bincount(col, weights=y, minlength=width)
+    ymin = np.full(width, np.inf)
+    ymax = np.full(width, -np.inf)
+    np.minimum.at(ymin, col, y)
+    np.maximum.at(ymax, col, y)
+    used = count > 0
+    centers = lo + (np.arange(width) + 0.5) * ((hi - lo) / width)
+    if is_time:
+        centers = centers.astype(np.int64).view("datetime64[ns]")
+    return centers[used], ymin[used], ymax[used], total[used] / count[used]
+
+
+def density_grid(x, y, width, height):
+    """2D point counts on a ``height`` x ``width`` pixel grid.
+
+    Returns:
+        Tuple ``(counts, extent)``: ``counts`` has shape ``(height, width)``
+        with row 0 at the lowest ``y``; ``extent`` is ``(x0, x1, y0, y1)``,
+        as ``imshow(..., origin="lower", extent=extent)`` expects.
+    """
+    xf, okx, _ = _coords(x)
+    yf, oky, _ = _coords(y)
+    ok = okx & oky
+    xf, yf = xf[ok], yf[ok]
+    if not len(xf):
+        return np.zeros((height, width), dtype=np.int64), (0.0, 1.0, 0.0, 1.0)
+    x0, x1, y0, y1 = xf.min(), xf.max(), yf.min(), yf.max()
+    cells = _bin(yf, y0, y1, height) * width + _bin(xf, x0, x1, width)
+    counts = np.bincount(cells, minlength=width * height).reshape(height, width)
+    return counts, (x0, x1, y0, y1)
@@ -0,0 +1,104 @@
+"""On-disk cache of ProfileStats keyed by input content hash + profile config."""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from load_data import expand_paths, is_dataset
+from profile_stats import ProfileStats
+
+# Bump when the ProfileStats layout or any statistic's definition changes
+CACHE_VERSION = 4
+
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ai-data-analysis-skill', 'profiles')
+
+
+def file_digest(filepath, cache_dir=None, block_size=1 << 23):
+    """BLAKE2b digest of the file's content.
+
+    Digests are remembered per (absolute path, size, mtime), so an unchanged
+    file is not re-read on the next run.
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    index_path = os.path.join(cache_dir, 'digests.json')
+    st = os.stat(filepath)
+    stamp = [st.st_size, st.st_mtime_ns]
+    abspath = os.path.abspath(filepath)
+    try:
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    entry = index.get(abspath)
+    if entry and entry['stamp'] == stamp:
+        return entry['digest']
+
+    h = hashlib.blake2b(digest_size=20)
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    digest = h.hexdigest()
+    index[abspath] = {'stamp': stamp, 'digest': digest}
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+    except OSError:
+        pass
+    return digest
+
+
+def cache_key(filepath, config, cache_dir=None):
+    """Key combining the file's content digest with the profile ``config`` dict.
+
+    For a dataset (directory, glob or list) the digest covers every file's
+    path and content, so adding, removing or changing a file is a miss.
+    """
+    if is_dataset(filepath):
+        digest = [[f, file_digest(f, cache_dir)] for f in expand_paths(filepath)]
+    else:
+        digest = file_digest(filepath, cache_dir)
+    payload = json.dumps({'digest': digest, 'config': config,
+                          'version': CACHE_VERSION}, sort_keys=True)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def load_cached(key, cache_dir=None):
+    """Cached ``ProfileStats`` for ``key``, or None on a miss or unreadable entry."""
+    path = os.path.join(cache_dir or default_cache_dir(), key)
+    if not os.path.isdir(path):
+        return None
+    try:
+        return ProfileStats.load(path)
+    except Exception:
+        # A stale or half-written entry is just a miss
+        return None
+
+
+def store(key, stats, cache_dir=None):
+    """Persist ``stats`` under ``key``; failures leave the run unaffected."""
+    cache_dir = cache_dir or default_cache_dir()
+    path = os.path.join(cache_dir, key)
+    tmp = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp-')
+        stats.save(tmp)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        os.replace(tmp, path)
+    except Exception:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return False
+    return True
+
+
+def clear_cache(cache_dir=None):
+    """Delete every cached profile."""
+    shutil.rmtree(cache_dir or default_cache_dir(), ignore_errors=True)
@@ -0,0 +1,316 @@
+"""Per-run statistics shared by every auto_eda chart and report section."""
+
+import json
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from pixel_agg import line_pixels
+from sketches import QuantileSketch, TopKSketch
+
+
+QUANTILE_METHODS = ("exact", "sketch")
+
+
+def column_quartiles(s, method="exact", capacity=4096, block=1 << 20):
+    """``(q1, median, q3, rank_error)`` of a numeric Series, ignoring NaN.
+
+    ``"exact"`` is a single ``np.nanpercentile`` pass (linear interpolation,
+    like ``Series.quantile``). ``"sketch"`` feeds the column to a
+    ``QuantileSketch`` in blocks, so extra memory stays bounded on very large
+    columns; ``rank_error`` is its guaranteed normalized rank error.
+    """
+    values = s.to_numpy(dtype=float, na_value=np.nan)
+    if method == "exact":
+        q1, q2, q3 = np.nanpercentile(values, [25, 50, 75])
+        return q1, q2, q3, 0.0
+    if method == "sketch":
+        sk = QuantileSketch(capacity)
+        for start in range(0, len(values), block):
+            sk.update(values[start:start + block])
+        q1, q2, q3 = sk.quantile([0.25, 0.5, 0.75])
+        return q1, q2, q3, sk.error_bound()
+    raise ValueError(f"Unknown quantile method: {method!r} (expected one of {QUANTILE_METHODS})")
+
+
+def iqr_summary(s, q1, q3, n=None, rank_error=0.0):
+    """IQR fences and outlier count for a numeric Series given its quartiles.
+
+    ``rank_error`` is the quartiles' rank error bound (0 when exact).
+    """
+    iqr = q3 - q1
+    lo = q1 - 1.5 * iqr
+    hi = q3 + 1.5 * iqr
+    n = s.count() if n is None else n
+    count = int(((s < lo) | (s > hi)).sum())
+    return {"q1": float(q1), "q3": float(q3), "iqr": float(iqr),
+            "low": float(lo), "high": float(hi),
+            "outlier_count": count,
+            "outlier_ratio": float(count / max(1, n)),
+            "rank_error": float(rank_error)}
+
+
+def topk_counts(s, k=20, capacity=4096, block=1 << 20):
+    """The ``k`` most frequent values of ``s`` with their counts.
+
+    Values are counted in their native (or categorical) dtype, without a
+    string copy of the column; only the ``k`` result labels become strings.
+    Columns longer than ``block`` rows are summarized block by block with a
+    Misra-Gries sketch of ``capacity`` counters, so memory stays bounded even
+    with millions of distinct values. Counts are exact while the column has
+    at most ``capacity`` distinct values; otherwise each is a lower bound at
+    most ``attrs["error"]`` below the true count.
+    """
+    if len(s) <= block:
+        vc, error = s.value_counts(dropna=True), 0
+        vc = vc[vc > 0]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            # Break ties by first appearance (not category order), as for
+            # plain columns, so a compacted frame yields the same top k
+            first_seen = s.drop_duplicates().dropna()
+            vc = vc.reindex(first_seen).sort_values(ascending=False, kind="stable")
+    else:
+        sk = TopKSketch(capacity)
+        for start in range(0, len(s), block):
+            sk.update(s.iloc[start:start + block])
+        vc, error = sk.top(k), sk.error
+    top = vc.head(k)
+    top.index = top.index.astype(str)
+    top.attrs["error"] = int(error)
+    return top
+
+
+TREND_FREQS = (("D", 1), ("W", 7), ("M", 30.44))
+
+
+def trend_frequency(span_days, n, max_points=500, min_buckets=30, min_rows=10):
+    """Resample frequency for a trend over ``span_days`` with ``n`` rows.
+
+    The finest of day / week / month that yields at most ``max_points``
+    buckets of ``min_rows`` rows on average. When every frequency is that
+    sparse, the coarsest one still giving ``min_buckets`` buckets. None when
+    even daily buckets would be fewer than ``min_buckets`` (a span of a few
+    days), where equal-width time bins keep more detail.
+    """
+    choice = None
+    for freq, days in TREND_FREQS:
+        buckets = span_days / days + 1
+        if buckets < min_buckets:
+            break
+        choice = freq
+        if buckets <= max_points and n / buckets >= min_rows:
+            return freq
+    return choice
+
+
+def _bucket_starts(t, freq):
+    """Start of each value's day / week (Monday) / month bucket, as datetime64."""
+    if freq == "M":
+        return t.astype("datetime64[M]")
+    days = t.astype("datetime64[D]")
+    if freq == "W":
+        # Day 0 (1970-01-01) is a Thursday
+        d = days.view("int64")
+        days = ((d + 3) // 7 * 7 - 3).astype("datetime64[D]")
+    return days
+
+
+def trend_points(df, time_col, y_col, parsed=None, max_points=500):
+    """``(x, y, ymin, ymax)`` arrays for the trend of ``y_col`` over ``time_col``.
+
+    ``parsed`` is ``time_col`` already converted to datetime (e.g. by role
+    inference); otherwise the column is parsed here. Up to ``max_points``
+    rows are returned as raw points sorted by time, with ``ymin``/``ymax``
+    None. Larger tables are never sorted: rows are grouped by a hash key into
+    day, week or month buckets (see ``trend_frequency``), or into
+    ``max_points`` equal-width time bins for short spans, and ``y`` is the
+    bucket mean with its min/max band.
+    """
+    t = parsed if parsed is not None else pd.to_datetime(df[time_col], errors="coerce")
+    if not pd.api.types.is_datetime64_any_dtype(t):
+        # Mixed UTC offsets parse to objects
+        t = pd.to_datetime(t, errors="coerce", utc=True)
+    if t.dt.tz is not None:
+        t = t.dt.tz_localize(None)
+    t = t.to_numpy(dtype="datetime64[ns]")
+    y = df[y_col].to_numpy(dtype=float, na_value=np.nan)
+    ok = ~(np.isnat(t) | np.isnan(y))
+    t, y = t[ok], y[ok]
+    if len(t) <= max_points:
+        order = np.argsort(t, kind="stable")
+        return t[order], y[order], None, None
+    t0, t1 = t.min(), t.max()
+    freq = trend_frequency((t1 - t0) / np.timedelta64(1, "D"), len(t), max_points)
+    if freq is None:
+        x, lo, hi, mean = line_pixels(t, y, max_points)
+        return x, mean, lo, hi
+    g = pd.Series(y).groupby(_bucket_starts(t, freq)).agg(["mean", "min", "max"])
+    return (g.index.to_numpy(dtype="datetime64[ns]"), g["mean"].to_numpy(),
+            g["min"].to_numpy(), g["max"].to_numpy())
+
+
+@dataclass
+class ProfileStats:
+    """Everything the report and charts need, computed once per run.
+
+    Build it with ``from_frame`` (in memory) or ``StreamProfile.to_stats``
+    (chunked); renderers only read from it and never touch the raw data.
+    Only the columns that get charted carry histograms / top-k counts /
+    outlier summaries. ``trend`` is ``(time_col, y_col, x, y, ymin, ymax)``;
+    ``ymin``/``ymax`` bound each resampled point and are None for raw points.
+    """
+
+    n_rows: int
+    columns: list
+    roles: dict
+    missing: pd.Series
+    describe: pd.DataFrame
+    corr: pd.DataFrame
+    hists: dict = field(default_factory=dict)
+    outliers: dict = field(default_factory=dict)
+    value_counts: dict = field(default_factory=dict)
+    group_means: dict = field(default_factory=dict)
+    trend: tuple = None
+    approximate: bool = False
+
+    @property
+    def n_cols(self):
+        return len(self.columns)
+
+    @classmethod
+    def from_frame(cls, df, roles, max_numeric_hists=6, max_cat_bars=4, top_k=20,
+                   hist_bins=30, quantile_method="exact", parsed_dates=None):
+        """Compute every section from ``df`` in memory.
+
+        ``parsed_dates`` maps datetime columns to their already parsed values
+        (``infer_column_roles(..., parsed=...)``), so the trend does not parse
+        its time column again.
+        """
+        num_cols = roles["numeric"]
+        num = df[num_cols]
+
+        # One pass each for missingness, moments and quartiles
+        missing = df.isna().mean()
+        count = num.count()
+        rank_error = pd.Series(0.0, index=num_cols)
+        if quantile_method == "exact" or not num_cols:
+            quart = num.quantile([0.25, 0.5, 0.75])
+        else:
+            qs = {c: column_quartiles(num[c], quantile_method) if count[c] else
+                  (np.nan, np.nan, np.nan, 0.0) for c in num_cols}
+            quart = pd.DataFrame({c: q[:3] for c, q in qs.items()}, index=[0.25, 0.5, 0.75])
+            rank_error = pd.Series({c: q[3] for c, q in qs.items()}, dtype=float)
+        describe = pd.DataFrame({
+            "count": count, "mean": num.mean(), "std": num.std(), "min": num.min(),
+            "25%": quart.loc[0.25], "50%": quart.loc[0.5], "75%": quart.loc[0.75],
+            "max": num.max(),
+        }, index=num_cols)
+        corr = num.corr(numeric_only=True) if len(num_cols) >= 2 else pd.DataFrame()
+
+        hists, outliers = {}, {}
+        for col in num_cols[:max_numeric_hists]:
+            s = num[col]
+            if count[col] == 0:
+                hists[col] = np.histogram([], bins=hist_bins)
+                outliers[col] = None
+                continue
+            values = s.to_numpy(dtype=float, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            hists[col] = np.histogram(
+                values, bins=hist_bins, range=(describe.at[col, "min"], describe.at[col, "max"]))
+            outliers[col] = iqr_summary(s, quart.at[0.25, col], quart.at[0.75, col],
+                                        n=count[col], rank_error=rank_error[col])
+
+        value_counts = {col: topk_counts(df[col], top_k)
+                        for col in roles["categorical"][:max_cat_bars]}
+
+        group_means = {}
+        if roles["categorical"] and num_cols:
+            ycols = num_cols[:2]
+            for ccol in roles["categorical"][:2]:
+                group_means[ccol] = df.groupby(ccol, observed=True)[ycols].mean(numeric_only=True)
+
+        trend = None
+        if roles["datetime"] and num_cols:
+            tcol, ycol = roles["datetime"][0], num_cols[0]
+            trend = (tcol, ycol, *trend_points(df, tcol, ycol,
+                                               parsed=(parsed_dates or {}).get(tcol)))
+
+        return cls(n_rows=len(df), columns=list(df.columns), roles=roles,
+                   missing=missing, describe=describe, corr=corr, hists=hists,
+                   outliers=outliers, value_counts=value_counts,
+                   group_means=group_means, trend=trend)
+
+    # -- persistence ------------------------------------------------------
+
+    def save(self, path):
+        """Write the stats to directory ``path`` as Parquet tables + ``meta.json``."""
+        os.makedirs(path, exist_ok=True)
+        meta = {
+            "n_rows": int(self.n_rows), "columns": [str(c) for c in self.columns],
+            "roles": self.roles, "outliers": self.outliers,
+            "group_cols": list(self.group_means), "approximate": self.approximate,
+            "trend": list(self.trend[:2]) if self.trend is not None else None,
+        }
+        pd.DataFrame({"column": self.missing.index.astype(str),
+                      "rate": self.missing.to_numpy()}).to_parquet(
+            os.path.join(path, "missing.parquet"), index=False)
+        self.describe.to_parquet(os.path.join(path, "describe.parquet"))
+        self.corr.to_parquet(os.path.join(path, "corr.parquet"))
+        pd.DataFrame(
+            [(col, edges[i], edges[i + 1], counts[i])
+             for col, (counts, edges) in self.hists.items() for i in range(len(counts))],
+            columns=["column", "left", "right", "count"],
+        ).to_parquet(os.path.join(path, "hists.parquet"), index=False)
+        pd.DataFrame(
+            [(col, str(v), int(n), vc.attrs.get("error", 0))
+             for col, vc in self.value_counts.items() for v, n in vc.items()],
+            columns=["column", "value", "count", "error"],
+        ).to_parquet(os.path.join(path, "value_counts.parquet"), index=False)
+        for i, g in enumerate(self.group_means.values()):
+            g.to_parquet(os.path.join(path, f"groups_{i}.parquet"))
+        if self.trend is not None:
+            x, y, lo, hi = self.trend[2:]
+            t = pd.DataFrame({"x": x, "y": y})
+            if lo is not None:
+                t["lo"], t["hi"] = lo, hi
+            t.to_parquet(os.path.join(path, "trend.parquet"), index=False)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        """Read stats written by ``save``."""
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        missing = pd.read_parquet(os.path.join(path, "missing.parquet"))
+        hists = {}
+        for col, h in pd.read_parquet(os.path.join(path, "hists.parquet")).groupby(
+                "column", sort=False):
+            edges = np.append(h["left"].to_numpy(), h["right"].iloc[-1])
+            hists[col] = (h["count"].to_numpy(), edges)
+        value_counts = {}
+        for col, v in pd.read_parquet(os.path.join(path, "value_counts.parquet")).groupby(
+                "column", sort=False):
+            vc = pd.Series(v["count"].to_numpy(), index=pd.Index(v["value"].to_numpy(), name=col),
+                           name="count")
+            vc.attrs["error"] = int(v["error"].iloc[0])
+            value_counts[col] = vc
+        group_means = {col: pd.read_parquet(os.path.join(path, f"groups_{i}.parquet"))
+                       for i, col in enumerate(meta["group_cols"])}
+        trend = None
+        if meta["trend"]:
+            t = pd.read_parquet(os.path.join(path, "trend.parquet"))
+            band = (t["lo"].to_numpy(), t["hi"].to_numpy()) if "lo" in t else (None, None)
+            trend = (*meta["trend"], t["x"].to_numpy(), t["y"].to_numpy(), *band)
+        return cls(
+            n_rows=meta["n_rows"], columns=meta["columns"], roles=meta["roles"],
+            missing=pd.Series(missing["rate"].to_numpy(), index=missing["column"].to_numpy()),
+            describe=pd.read_parquet(os.path.join(path, "describe.parquet")),
+            corr=pd.read_parquet(os.path.join(path, "corr.parquet")),
+            hists={c: hists.get(c, (np.zeros(0), np.zeros(1))) for c in meta["outliers"]},
+            outliers=meta["outliers"], value_counts=value_counts,
+            group_means=group_means, trend=trend, approximate=meta["approximate"],
+        )
@@ -2,16 +2,43 @@
 
 import sys
 import os
+from dataclasses import replace
 
 sys.path.insert(0, os.path.dirname(__file__))
 from find_chinese_font import find_chinese_font
+from output_profiles import get_profile
+from pixel_agg import density_grid, line_pixels
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+
+
+def _save(fig, output, profile=None):
+    """Save ``fig`` to ``output`` (see ``create_bar_chart``); return the path written."""
+    if profile is None:
+        profile = get_profile()
+        ext = os.path.splitext(output)[1].lower().lstrip('.')
+        if ext:
+            profile = replace(profile, format=ext)
+    else:
+        profile = get_profile(profile)
+    output = profile.path(output)
+    profile.save(fig, output)
+    print(f"Chart saved to: {output}")
+    return output
+
 
+def create_bar_chart(df, x_col, y_col, title='', output='chart.png',
+                     profile=None):
+    """Create a professional bar chart with optional Chinese font support.
 
-def create_bar_chart(df, x_col, y_col, title='', output='chart.png'):
-    """Create a professional bar chart with optional Chinese font support."""
+    Without ``profile`` the chart is written at print resolution in the
+    format of ``output``'s extension (.png, .svg, .pdf, .jpg, ...). An output
+    profile ("draft", "screen", "print") sets the format as well, and
+    ``output``'s extension is changed to match. Returns the saved path.
+    """
     chinese_font = find_chinese_font()
 
     plt.close('all')
@@ -49,21 +76,48 @@ def create_bar_chart(df, x_col, y_col, title='', output='chart.png'):
     ax.set_ylim(0, df[y_col].max() * 1.15)
 
     plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight')
-    print(f"Chart saved to: {output}")
+    return _save(fig, output, profile)
+
+
+def _numeric_axis(s):
+    """``s`` as numbers or datetimes for binning, or None for labels that are neither."""
+    if pd.api.types.is_numeric_dtype(s) or pd.api.types.is_datetime64_any_dtype(s):
+        return s.to_numpy()
+    parsed = pd.to_datetime(s, errors='coerce')
+    return parsed.to_numpy() if parsed.notna().mean() >= 0.9 else None
 
 
-def create_line_chart(df, x_col, y_col, title='', output='chart.png'):
-    """Create a professional line chart with optional Chinese font support."""
+def create_line_chart(df, x_col, y_col, title='', output='chart.png',
+                      profile=None):
+    """Create a professional line chart with optional Chinese font support.
+
+    Without ``profile`` the chart is written at print resolution in the
+    format of ``output``'s extension (.png, .svg, .pdf, .jpg, ...). An output
+    profile ("draft", "screen", "print") sets the format as well, and
+    ``output``'s extension is changed to match. Returns the saved path.
+
+    With more rows than pixel columns (and a numeric or date x), points are
+    binned per pixel column and drawn as a min-max band plus the mean line,
+    so rendering time does not grow with the row count.
+    """
     chinese_font = find_chinese_font()
+    dpi = get_profile(profile).dpi
 
     plt.close('all')
     fig, ax = plt.subplots(figsize=(12, 6))
 
     font_kwargs = {'fontproperties': chinese_font} if chinese_font else {}
 
-    ax.plot(df[x_col].astype(str), df[y_col], marker='o', linewidth=2,
-            color='#3498DB', markersize=6)
+    width = int(fig.get_figwidth() * dpi)
+    x = _numeric_axis(df[x_col]) if len(df) > 2 * width else None
+    if x is not None:
+        y = pd.to_numeric(df[y_col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        xc, lo, hi, mean = line_pixels(x, y, width)
+        ax.fill_between(xc, lo, hi, color='#3498DB', alpha=0.25, linewidth=0)
+        ax.plot(xc, mean, linewidth=1.5, color='#3498DB')
+    else:
+        ax.plot(df[x_col].astype(str), df[y_col], marker='o', linewidth=2,
+                color='#3498DB', markersize=6)
 
     ax.set_xlabel(x_col, fontsize=12, fontweight='bold', **font_kwargs)
     ax.set_ylabel(y_col, fontsize=12, fontweight='bold', **font_kwargs)
@@ -80,12 +134,64 @@ def create_line_chart(df, x_col, y_col, title='', output='chart.png'):
     ax.spines['right'].set_visible(False)
 
     plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight')
-    print(f"Chart saved to: {output}")
+    return _save(fig, output, profile)
+
 
+def create_scatter_chart(df, x_col, y_col, title='', output='chart.png',
+                         profile=None, max_points=50_000):
+    """Create a scatter chart with optional Chinese font support.
 
-def create_pie_chart(df, label_col, value_col, title='', output='chart.png'):
-    """Create a professional pie chart with optional Chinese font support."""
+    Above ``max_points`` rows the points are counted on a pixel grid and
+    drawn as a log-scaled 2D density image instead of one marker per row.
+    ``profile`` and the return value are as for ``create_bar_chart``.
+    """
+    chinese_font = find_chinese_font()
+    dpi = get_profile(profile).dpi
+
+    plt.close('all')
+    fig, ax = plt.subplots(figsize=(10, 8))
+
+    font_kwargs = {'fontproperties': chinese_font} if chinese_font else {}
+
+    x = pd.to_numeric(df[x_col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    y = pd.to_numeric(df[y_col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    if len(df) > max_points:
+        counts, extent = density_grid(x, y, int(fig.get_figwidth() * dpi),
+                                      int(fig.get_figheight() * dpi))
+        im = ax.imshow(np.ma.masked_equal(counts, 0), origin='lower', extent=extent,
+                       aspect='auto', cmap='viridis', norm=LogNorm(),
+                       interpolation='nearest')
+        fig.colorbar(im, ax=ax, label='Count')
+    else:
+        ax.scatter(x, y, s=12, alpha=0.6, color='#3498DB', edgecolors='none')
+
+    ax.set_xlabel(x_col, fontsize=12, fontweight='bold', **font_kwargs)
+    ax.set_ylabel(y_col, fontsize=12, fontweight='bold', **font_kwargs)
+    ax.set_title(title or f'{y_col} vs {x_col}', fontsize=14, fontweight='bold',
+                 **font_kwargs)
+
+    if chinese_font:
+        for label in ax.get_xticklabels() + ax.get_yticklabels():
+            label.set_fontproperties(chinese_font)
+
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.set_axisbelow(True)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    plt.tight_layout()
+    return _save(fig, output, profile)
+
+
+def create_pie_chart(df, label_col, value_col, title='', output='chart.png',
+                     profile=None):
+    """Create a professional pie chart with optional Chinese font support.
+
+    Without ``profile`` the chart is written at print resolution in the
+    format of ``output``'s extension (.png, .svg, .pdf, .jpg, ...). An output
+    profile ("draft", "screen", "print") sets the format as well, and
+    ``output``'s extension is changed to match. Returns the saved path.
+    """
     chinese_font = find_chinese_font()
 
     plt.close('all')
@@ -108,5 +214,4 @@ def create_pie_chart(df, label_col, value_col, title='', output='chart.png'):
                  **(({'fontproperties': chinese_font} if chinese_font else {})))
 
     plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight')
-    print(f"Chart saved to: {output}")
+    return _save(fig, output, profile)
@@ -0,0 +1,227 @@
+"""Mergeable, bounded-memory sketches used by the EDA pipeline."""
+
+import numpy as np
+import pandas as pd
+
+_HASH_SPACE = float(2 ** 64)
+
+
+def _hash_values(values):
+    """Hash a Series/array of values to uint64 (nulls must be dropped first)."""
+    return pd.util.hash_pandas_object(
+        pd.Series(values), index=False, categorize=False).to_numpy()
+
+
+def _k_smallest_unique(h, k):
+    """Return up to k smallest distinct values of a uint64 array, sorted."""
+    if len(h) <= k:
+        return np.unique(h)
+    m = k
+    while True:
+        part = np.partition(h, m - 1)[:m]
+        u = np.unique(part)
+        if len(u) >= k or m >= len(h):
+            return u[:k]
+        m = min(len(h), m * 4)
+
+
+class DistinctSketch:
+    """K-minimum-values (KMV) estimator of the number of distinct values.
+
+    Keeps the ``k`` smallest distinct 64-bit hashes seen so far. Below ``k``
+    distinct values the count is exact; above it the relative standard error
+    is about ``1 / sqrt(k - 2)`` (~1.6% for the default ``k=4096``).
+    Two sketches with the same ``k`` can be merged.
+    """
+
+    def __init__(self, k=4096):
+        self.k = k
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, values):
+        """Add a Series/array of non-null values to the sketch."""
+        if len(values) == 0:
+            return self
+        h = _hash_values(values)
+        self.hashes = _k_smallest_unique(np.concatenate([self.hashes, h]), self.k)
+        return self
+
+    def merge(self, other):
+        """Fold another sketch (same ``k``) into this one."""
+        self.hashes = _k_smallest_unique(
+            np.concatenate([self.hashes, other.hashes]), self.k)
+        return self
+
+    @property
+    def is_exact(self):
+        return len(self.hashes) < self.k
+
+    def estimate(self):
+        """Estimated number of distinct values."""
+        if self.is_exact:
+            return float(len(self.hashes))
+        kth = float(self.hashes[-1]) + 1.0
+        return (self.k - 1) * _HASH_SPACE / kth
+
+
+def approx_nunique(s, k=4096):
+    """Approximate ``s.nunique(dropna=True)`` with a KMV sketch."""
+    return DistinctSketch(k).update(s.dropna()).estimate()
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch built from a stack of sorting compactors.
+
+    Level ``h`` holds items of weight ``2**h``. When a level exceeds
+    ``capacity`` items it is sorted and every other item (random offset) is
+    promoted to the next level. Each compaction at level ``h`` moves any rank
+    by at most ``2**h``; the running total is kept in ``rank_error`` so
+    ``error_bound()`` is a guaranteed (worst-case) normalized rank error.
+    Min and max are tracked exactly.
+    """
+
+    def __init__(self, capacity=4096, seed=0):
+        self.capacity = capacity
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.rank_error = 0.0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """Add numeric values (NaNs are ignored)."""
+        v = np.asarray(values, dtype=float)
+        v = v[~np.isnan(v)]
+        if v.size == 0:
+            return self
+        self.n += v.size
+        self.min = min(self.min, float(v.min()))
+        self.max = max(self.max, float(v.max()))
+        self.levels[0] = np.concatenate([self.levels[0], v])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.rank_error += other.rank_error
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if items.size > self.capacity:
+                items = np.sort(items)
+                odd = items.size % 2
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                promoted = items[odd:][self._rng.integers(2)::2]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                self.levels[h] = items[:odd]
+                self.rank_error += 2.0 ** h
+            h += 1
+
+    def items(self):
+        """Retained values and their weights (for histograms)."""
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(items.size, 2.0 ** h) for h, items in enumerate(self.levels)])
+        return values, weights
+
+    def _sorted(self):
+        values, weights = self.items()
+        order = np.argsort(values, kind="stable")
+        return values[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        """Approximate quantile(s) ``q`` in [0, 1].
+
+        Interpolates linearly between adjacent values like ``np.percentile``
+        (an item of weight ``w`` stands for ``w`` equal values), so the
+        result is exact while nothing has been compacted.
+        """
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        values, cum = self._sorted()
+        pos = np.asarray(q, dtype=float) * (cum[-1] - 1)
+        i = np.clip(np.searchsorted(cum, pos, side="right"), 0, len(values) - 1)
+        j = np.minimum(i + 1, len(values) - 1)
+        # Only the last copy of item i is interpolated towards the next item
+        frac = np.clip(pos - (cum[i] - 1), 0.0, 1.0)
+        out = values[i] + frac * (values[j] - values[i])
+        # Pin the extremes to the exact min/max
+        out = np.where(np.asarray(q) <= 0, self.min, out)
+        out = np.where(np.asarray(q) >= 1, self.max, out)
+        return out if np.ndim(q) else float(out)
+
+    def cdf(self, x, side="right"):
+        """Approximate fraction of values ``<= x`` (``side="right"``) or ``< x``."""
+        if self.n == 0:
+            return 0.0
+        values, cum = self._sorted()
+        i = np.searchsorted(values, x, side=side)
+        return float(cum[i - 1] / cum[-1]) if i > 0 else 0.0
+
+    def error_bound(self):
+        """Worst-case rank error as a fraction of ``n``."""
+        return self.rank_error / self.n if self.n else 0.0
+
+
+class TopKSketch:
+    """Misra-Gries heavy-hitter summary keeping at most ``capacity`` counters.
+
+    Counts are lower bounds; each is at most ``error`` below the true count,
+    and ``error <= n / (capacity + 1)``. Values stay in their native dtype.
+    Two sketches can be merged; below ``capacity`` distinct values the counts
+    are exact.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+        self.n = 0
+        self.error = 0
+
+    def update(self, values):
+        """Add a Series of values (nulls are ignored)."""
+        return self.add_counts(pd.Series(values).value_counts(dropna=True))
+
+    def add_counts(self, vc):
+        """Add pre-aggregated counts (a ``value_counts()`` Series)."""
+        self.n += int(vc.sum())
+        self._absorb(vc)
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        self.n += other.n
+        self.error += other.error
+        self._absorb(other.counts)
+        return self
+
+    def _absorb(self, vc):
+        vc = vc[vc > 0]  # categoricals report unobserved categories as 0
+        if vc.empty:
+            return
+        if vc.index.dtype == "category":
+            vc.index = vc.index.astype(vc.index.categories.dtype)
+        counts = vc if self.counts.empty else self.counts.add(vc, fill_value=0)
+        counts = counts.astype("int64")
+        if len(counts) > self.capacity:
+            cut = int(counts.nlargest(self.capacity + 1).iloc[-1])
+            counts = counts[counts > cut] - cut
+            self.error += cut
+        self.counts = counts
+
+    def top(self, k=20):
+        """The ``k`` heaviest values with their (lower-bound) counts."""
+        return self.counts.sort_values(ascending=False, kind="stable").head(k)